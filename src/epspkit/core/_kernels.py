@@ -0,0 +1,590 @@
+"""
+Compiled numeric kernels backing the feature analyzers.
+
+Numba is an optional dependency. When it is installed the kernels below are
+JIT-compiled. Without it, the entry points the features call are replaced at
+the end of this module by whole-array NumPy and SciPy equivalents (the loop
+bodies would otherwise run sample by sample in Python). Those agree with the
+compiled kernels on peak and trough indices; fitted values can differ in the
+last bits, since the compiled kernels use ``fastmath`` where exact
+comparisons do not matter. The remaining loop kernels (``_lttb``,
+``_fir_rows``, ...) are only called when ``NUMBA_AVAILABLE`` is true.
+"""
+from __future__ import annotations
+
+import functools
+import threading
+
+import numpy as np
+
+try:
+    from numba import get_num_threads, njit, prange
+except ImportError:  # pragma: no cover - optional dependency
+    njit = None
+    prange = range
+
+    def get_num_threads() -> int:
+        return 1
+
+NUMBA_AVAILABLE = njit is not None
+
+# Numba's default "workqueue" threading layer is not thread-safe: two
+# threads launching parallel kernels at once can crash or corrupt results.
+# Parallel kernels already use every core, so launches are serialized.
+_PARALLEL_LOCK = threading.Lock()
+
+
+def _jit(signatures: list[str], parallel: bool = False, fastmath: bool = True):
+    """
+    Compile with Numba when available; ``parallel`` enables ``prange``.
+
+    Explicit signatures (one per supported trace dtype, float64 and
+    float32) make Numba compile eagerly at import rather than on first
+    call, and ``cache=True`` lets later imports load the compiled code from
+    ``__pycache__`` instead of recompiling. Samples are widened to float64
+    as they are read, so float32 traces only save memory traffic.
+    Kernels whose results hinge on exact comparisons (peak detection)
+    pass ``fastmath=False`` so they stay bit-identical to SciPy.
+    Parallel kernels are called under ``_PARALLEL_LOCK`` so they are safe
+    to launch from several Python threads.
+    """
+    def decorate(func):
+        if not NUMBA_AVAILABLE:
+            return func
+        kernel = njit(
+            signatures,
+            cache=True,
+            fastmath=fastmath,
+            nogil=True,
+            parallel=parallel,
+        )(func)
+        if not parallel:
+            return kernel
+
+        @functools.wraps(func)
+        def locked(*args):
+            with _PARALLEL_LOCK:
+                return kernel(*args)
+        locked.kernel = kernel
+        return locked
+    return decorate
+
+
+def _as_traces(y) -> np.ndarray:
+    """C-contiguous float32/float64 view (or copy) of y for the kernels."""
+    y = np.asarray(y)
+    if y.dtype not in (np.float32, np.float64):
+        y = y.astype(np.float64)
+    return np.ascontiguousarray(y)
+
+
+@_jit([
+    "UniTuple(i8, 2)(f8[::1], f8[::1], i8, i8)",
+    "UniTuple(i8, 2)(f8[::1], f4[::1], i8, i8)",
+])
+def _window_minima(x, y, start_idx, stop_idx):
+    """
+    Indices of the minimum of y and of dy/dx within [start_idx, stop_idx).
+
+    Single pass over the window: the derivative is ``np.gradient(y, x)``
+    (second-order differences on the actual sample times, one-sided at the
+    trace ends), evaluated inline and never materialized, so gaps left by
+    cropping are weighted correctly. Ties resolve to the first index, as
+    with ``np.argmin``.
+    """
+    last = y.size - 1
+    min_y = np.inf
+    min_dy = np.inf
+    y_idx = start_idx
+    dy_idx = start_idx
+    for i in range(start_idx, stop_idx):
+        if i == 0:
+            dyi = (np.float64(y[1]) - np.float64(y[0])) / (x[1] - x[0])
+        elif i == last:
+            dyi = (np.float64(y[last]) - np.float64(y[last - 1])) / (x[last] - x[last - 1])
+        else:
+            h1 = x[i] - x[i - 1]
+            h2 = x[i + 1] - x[i]
+            dyi = (
+                -h2 / (h1 * (h1 + h2)) * np.float64(y[i - 1])
+                + (h2 - h1) / (h1 * h2) * np.float64(y[i])
+                + h1 / (h2 * (h1 + h2)) * np.float64(y[i + 1])
+            )
+        yi = np.float64(y[i])
+        # Conditional selects rather than branches, so LLVM can emit
+        # cmov/blend instructions instead of unpredictable jumps.
+        new_dy = dyi < min_dy
+        min_dy = dyi if new_dy else min_dy
+        dy_idx = i if new_dy else dy_idx
+        new_y = yi < min_y
+        min_y = yi if new_y else min_y
+        y_idx = i if new_y else y_idx
+    return y_idx, dy_idx
+
+
+@_jit([
+    "UniTuple(f8, 3)(f8[::1], f8[::1], i8, i8)",
+    "UniTuple(f8, 3)(f8[::1], f4[::1], i8, i8)",
+])
+def _linreg(x, y, i0, i1):
+    """
+    Least-squares line through x[i0:i1], y[i0:i1].
+
+    One pass of running sums with no temporaries; ss_tot uses
+    sum((y - mean)**2) == sum(y**2) - n*mean**2. Samples are shifted by the
+    first point of the window so that identity stays well conditioned on
+    absolute times and voltages. Returns (m, b, r2), all NaN when x does not
+    vary over the window.
+    """
+    n = i1 - i0
+    x_ref = x[i0]
+    y_ref = np.float64(y[i0])
+    sx = 0.0
+    sy = 0.0
+    sxx = 0.0
+    sxy = 0.0
+    syy = 0.0
+    for i in range(i0, i1):
+        dx = x[i] - x_ref
+        dy = np.float64(y[i]) - y_ref
+        sx += dx
+        sy += dy
+        sxx += dx * dx
+        sxy += dx * dy
+        syy += dy * dy
+    var_x = sxx - sx * sx / n if n > 0 else 0.0
+    if not var_x > 0.0:
+        # Fewer than two distinct x define no line; returning NaN keeps
+        # compiled and pure-Python runs alike instead of one raising.
+        return np.nan, np.nan, np.nan
+    cov_xy = sxy - sx * sy / n
+    ss_tot = syy - sy * sy / n
+    m = cov_xy / var_x
+    b = (y_ref + sy / n) - m * (x_ref + sx / n)
+    ss_res = ss_tot - m * cov_xy
+    r2 = 1.0 - ss_res / ss_tot if ss_tot > 0.0 else np.nan
+    return m, b, r2
+
+
+@_jit(
+    [
+        "void(f8[::1], f8[:, ::1], i8, i8, i8, "
+        "f8[::1], f8[::1], f8[::1], f8[::1], f8[::1], f8[::1])",
+        "void(f8[::1], f4[:, ::1], i8, i8, i8, "
+        "f8[::1], f8[::1], f8[::1], f8[::1], f8[::1], f8[::1])",
+    ],
+    parallel=True,
+)
+def _epsp_kernel(
+    x,
+    traces,
+    start_idx,
+    stop_idx,
+    fit_distance,
+    out_epsp_s,
+    out_epsp_v,
+    out_slope_mid_s,
+    out_slope_mid_v,
+    out_slope,
+    out_r2,
+):
+    """
+    EPSP minimum and steepest-descent slope for each row of ``traces``.
+
+    Every row shares the time axis ``x``; the search window is
+    ``[start_idx, stop_idx)``. ``traces`` may be float32 or float64; sums
+    are accumulated in float64 and results are written into the
+    preallocated float64 ``out_*`` arrays (slope in mV/s, signed). Rows are independent and are
+    spread across cores when Numba is available.
+    """
+    n_samples = x.size
+    for k in prange(traces.shape[0]):
+        y = traces[k]
+        epsp_idx, slope_center_idx = _window_minima(x, y, start_idx, stop_idx)
+
+        i0 = max(0, slope_center_idx - fit_distance)
+        i1 = min(n_samples - 1, slope_center_idx + fit_distance)
+        m, _, r2 = _linreg(x, y, i0, i1 + 1)
+
+        out_epsp_s[k] = x[epsp_idx]
+        out_epsp_v[k] = np.float64(y[epsp_idx])
+        out_slope_mid_s[k] = x[slope_center_idx]
+        out_slope_mid_v[k] = np.float64(y[slope_center_idx])
+        out_slope[k] = m
+        out_r2[k] = r2
+
+
+@_jit([
+    "i8(f8[::1], i8, i8)",
+    "i8(f4[::1], i8, i8)",
+], fastmath=False)
+def _fv_trough(y, start_idx, stop_idx):
+    """
+    Index of the deepest local minimum of y within [start_idx, stop_idx).
+
+    Matches ``scipy.signal.find_peaks(-y[start_idx:stop_idx])`` followed by
+    taking the lowest trough: flat minima report their middle sample
+    (rounded down), the window's first and last samples never qualify, and
+    ties resolve to the earliest trough. Returns -1 when there is none.
+    """
+    best = -1
+    best_v = np.inf
+    i = start_idx + 1
+    last = stop_idx - 1
+    while i < last:
+        yi = np.float64(y[i])
+        if np.float64(y[i - 1]) > yi:
+            ahead = i + 1
+            while ahead < last and np.float64(y[ahead]) == yi:
+                ahead += 1
+            if np.float64(y[ahead]) > yi:
+                if yi < best_v:
+                    best_v = yi
+                    best = (i + ahead - 1) // 2
+                i = ahead
+        i += 1
+    return best
+
+
+@_jit([
+    "f8(f8[::1], i8, i8, i8)",
+    "f8(f4[::1], i8, i8, i8)",
+], fastmath=False)
+def _prominence(y, peak, i0, i1):
+    """
+    Prominence of y[peak] within [i0, i1), as ``scipy.signal.peak_prominences``.
+
+    Walks outward until a higher sample (or the window edge); the base is the
+    higher of the lowest points reached on either side.
+    """
+    yp = np.float64(y[peak])
+    left_min = yp
+    j = peak
+    while j >= i0 and np.float64(y[j]) <= yp:
+        left_min = min(left_min, np.float64(y[j]))
+        j -= 1
+    right_min = yp
+    j = peak
+    while j < i1 and np.float64(y[j]) <= yp:
+        right_min = min(right_min, np.float64(y[j]))
+        j += 1
+    return yp - max(left_min, right_min)
+
+
+@_jit([
+    "i8(f8[::1], i8, i8, i8[::1], f8[::1])",
+    "i8(f4[::1], i8, i8, i8[::1], f8[::1])",
+], fastmath=False)
+def _peaks_with_prominence(y, i0, i1, out_peaks, out_prominences):
+    """
+    Local maxima of y within [i0, i1) and their prominences.
+
+    Same peaks, in the same order, as ``scipy.signal.find_peaks`` on
+    ``y[i0:i1]`` (plateaus report their middle sample; the window's edge
+    samples never qualify). Fills the first n entries of the outputs, which
+    need room for ``(i1 - i0) // 2`` peaks, and returns n.
+    """
+    n = 0
+    i = i0 + 1
+    last = i1 - 1
+    while i < last:
+        yi = np.float64(y[i])
+        if np.float64(y[i - 1]) < yi:
+            ahead = i + 1
+            while ahead < last and np.float64(y[ahead]) == yi:
+                ahead += 1
+            if np.float64(y[ahead]) < yi:
+                peak = (i + ahead - 1) // 2
+                out_peaks[n] = peak
+                out_prominences[n] = _prominence(y, peak, i0, i1)
+                n += 1
+                i = ahead
+        i += 1
+    return n
+
+
+@_jit([
+    "i8(f8[::1], i8, i8, f8)",
+    "i8(f4[::1], i8, i8, f8)",
+], fastmath=False)
+def _ps_peak(y, i0, i1, min_prominence):
+    """
+    Index of the most prominent local maximum of y within [i0, i1).
+
+    Matches ``scipy.signal.find_peaks(y[i0:i1], prominence=min_prominence)``
+    followed by an argmax over the prominences (see ``_prominence``); ties
+    resolve to the earliest peak. Returns -1 when no peak qualifies.
+    """
+    best = -1
+    best_p = -np.inf
+    i = i0 + 1
+    last = i1 - 1
+    while i < last:
+        yi = np.float64(y[i])
+        if np.float64(y[i - 1]) < yi:
+            ahead = i + 1
+            while ahead < last and np.float64(y[ahead]) == yi:
+                ahead += 1
+            if np.float64(y[ahead]) < yi:
+                peak = (i + ahead - 1) // 2
+                prominence = _prominence(y, peak, i0, i1)
+                if prominence >= min_prominence and prominence > best_p:
+                    best_p = prominence
+                    best = peak
+                i = ahead
+        i += 1
+    return best
+
+
+@_jit(
+    [
+        "void(f8[:, ::1], i8, i8, i8[::1])",
+        "void(f4[:, ::1], i8, i8, i8[::1])",
+    ],
+    parallel=True,
+)
+def _fv_kernel(traces, start_idx, stop_idx, out_idx):
+    """``_fv_trough`` of every row of ``traces``, spread across cores."""
+    for k in prange(traces.shape[0]):
+        out_idx[k] = _fv_trough(traces[k], start_idx, stop_idx)
+
+
+@_jit(
+    [
+        "void(f8[:, ::1], i8[::1], i8[::1], f8, i8[::1])",
+        "void(f4[:, ::1], i8[::1], i8[::1], f8, i8[::1])",
+    ],
+    parallel=True,
+)
+def _ps_kernel(traces, i0, i1, min_prominence, out_idx):
+    """``_ps_peak`` of row k of ``traces`` within [i0[k], i1[k]), spread across cores."""
+    for k in prange(traces.shape[0]):
+        out_idx[k] = _ps_peak(traces[k], i0[k], i1[k], min_prominence)
+
+
+@_jit(
+    [
+        "void(f8[:, ::1], f8[::1], i8, i8, f8)",
+        "void(f4[:, ::1], f4[::1], i8, i8, f8)",
+    ],
+    parallel=True,
+)
+def _template_subtract(sweeps, template, start_idx, stop_idx, denom):
+    """
+    Subtract each row's least-squares multiple of ``template`` in place.
+
+    Within [start_idx, stop_idx) every row of ``sweeps`` loses
+    ``a * template`` with ``a = row . template / denom``. The dot product,
+    scale and subtraction are fused per row, so no (n_sweeps, window)
+    temporary is built; rows are spread across cores.
+    """
+    for i in prange(sweeps.shape[0]):
+        num = 0.0
+        for j in range(start_idx, stop_idx):
+            num += np.float64(sweeps[i, j]) * np.float64(template[j])
+        a = num / denom
+        for j in range(start_idx, stop_idx):
+            sweeps[i, j] -= a * np.float64(template[j])
+
+
+@_jit(
+    [
+        "void(f8[:, ::1], f8, f8[:, ::1])",
+        "void(f4[:, ::1], f8, f8[:, ::1])",
+    ],
+    parallel=True,
+)
+def _gradient_rows(traces, inv_dt, out):
+    """
+    ``np.gradient`` of every row of ``traces`` on a uniform grid, into ``out``.
+
+    Central differences inside, one-sided at the ends, scaled by ``inv_dt``
+    (1 / sample spacing); rows are spread across cores.
+    """
+    n = traces.shape[1]
+    half = 0.5 * inv_dt
+    for k in prange(traces.shape[0]):
+        out[k, 0] = (np.float64(traces[k, 1]) - np.float64(traces[k, 0])) * inv_dt
+        for i in range(1, n - 1):
+            out[k, i] = (np.float64(traces[k, i + 1]) - np.float64(traces[k, i - 1])) * half
+        out[k, n - 1] = (np.float64(traces[k, n - 1]) - np.float64(traces[k, n - 2])) * inv_dt
+
+
+@_jit(
+    [
+        "void(f8[::1], f8[::1], i8[::1])",
+        "void(f8[::1], f4[::1], i8[::1])",
+    ],
+    fastmath=False,
+)
+def _lttb(x, y, out_idx):
+    """
+    Largest-Triangle-Three-Buckets: indices of ``out_idx.size`` samples of
+    (x, y) that best keep the trace's visual shape.
+
+    First and last samples are always kept; each interior bucket keeps the
+    sample forming the largest triangle with the previously kept sample and
+    the mean of the next bucket. Requires 3 <= out_idx.size < x.size.
+    """
+    n = x.size
+    n_out = out_idx.size
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    out_idx[0] = 0
+    for i in range(n_out - 2):
+        # Mean of the next bucket (the last bucket is the final sample).
+        nxt_start = int((i + 1) * every) + 1
+        nxt_stop = min(int((i + 2) * every) + 1, n)
+        avg_x = 0.0
+        avg_y = 0.0
+        for j in range(nxt_start, nxt_stop):
+            avg_x += x[j]
+            avg_y += np.float64(y[j])
+        count = nxt_stop - nxt_start
+        avg_x /= count
+        avg_y /= count
+
+        ax = x[a]
+        ay = np.float64(y[a])
+        best = -1.0
+        best_j = int(i * every) + 1
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            area = abs((ax - avg_x) * (np.float64(y[j]) - ay) - (ax - x[j]) * (avg_y - ay))
+            if area > best:
+                best = area
+                best_j = j
+        out_idx[i + 1] = best_j
+        a = best_j
+    out_idx[n_out - 1] = n - 1
+
+
+@_jit(
+    [
+        # coeffs is read-only so the cached savgol taps pass without a copy.
+        "void(f8[:, ::1], Array(float64, 1, 'C', readonly=True), f8[:, ::1])",
+        "void(f4[:, ::1], Array(float64, 1, 'C', readonly=True), f4[:, ::1])",
+    ],
+    parallel=True,
+    fastmath=False,
+)
+def _fir_rows(traces, coeffs, out):
+    """
+    Centred convolution of every row of ``traces`` with ``coeffs``, into
+    ``out``, for the samples whose window lies inside the row.
+
+    Matches ``convolve1d(traces, coeffs, axis=-1)`` on those samples to
+    rounding; the first and last ``coeffs.size // 2`` samples of each row
+    are left for the caller. Each tap is applied across the whole row
+    before the next, so the inner loop vectorizes without fastmath, and
+    rows are spread across cores.
+    """
+    k = coeffs.size
+    half = k // 2
+    m = traces.shape[1] - 2 * half
+    for r in prange(traces.shape[0]):
+        acc = np.zeros(m)
+        for j in range(k):
+            c = coeffs[j]
+            off = 2 * half - j
+            for i in range(m):
+                acc[i] += c * np.float64(traces[r, i + off])
+        for i in range(m):
+            out[r, i + half] = acc[i]
+
+
+if not NUMBA_AVAILABLE:
+    import warnings
+
+    from scipy.signal import find_peaks, peak_prominences
+
+    def _linreg(x, y, i0, i1):
+        """NumPy ``_linreg``: the same shifted sums, over whole slices."""
+        if i1 - i0 < 2:
+            return np.nan, np.nan, np.nan
+        dx = x[i0:i1] - x[i0]
+        dy = np.asarray(y[i0:i1], dtype=np.float64) - np.float64(y[i0])
+        n = i1 - i0
+        sx, sy = dx.sum(), dy.sum()
+        var_x = dx @ dx - sx * sx / n
+        if not var_x > 0.0:
+            return np.nan, np.nan, np.nan
+        cov_xy = dx @ dy - sx * sy / n
+        ss_tot = dy @ dy - sy * sy / n
+        m = cov_xy / var_x
+        b = (np.float64(y[i0]) + sy / n) - m * (x[i0] + sx / n)
+        ss_res = ss_tot - m * cov_xy
+        r2 = 1.0 - ss_res / ss_tot if ss_tot > 0.0 else np.nan
+        return m, b, r2
+
+    def _epsp_kernel(
+        x,
+        traces,
+        start_idx,
+        stop_idx,
+        fit_distance,
+        out_epsp_s,
+        out_epsp_v,
+        out_slope_mid_s,
+        out_slope_mid_v,
+        out_slope,
+        out_r2,
+    ):
+        """NumPy ``_epsp_kernel``: both argmins for all rows in one call each."""
+        n_samples = x.size
+        # One sample of context either side keeps the window's differences
+        # central, as in the full-trace np.gradient.
+        lo, hi = max(start_idx - 1, 0), min(stop_idx + 1, n_samples)
+        window = np.asarray(traces[:, lo:hi], dtype=np.float64)
+        dy = np.gradient(window, x[lo:hi], axis=1)[:, start_idx - lo:stop_idx - lo]
+        y = window[:, start_idx - lo:stop_idx - lo]
+        # The compiled kernel never selects NaN samples; neither does this.
+        epsp_idx = start_idx + np.argmin(np.where(np.isnan(y), np.inf, y), axis=1)
+        center_idx = start_idx + np.argmin(np.where(np.isnan(dy), np.inf, dy), axis=1)
+
+        rows = np.arange(traces.shape[0])
+        out_epsp_s[:] = x[epsp_idx]
+        out_epsp_v[:] = traces[rows, epsp_idx]
+        out_slope_mid_s[:] = x[center_idx]
+        out_slope_mid_v[:] = traces[rows, center_idx]
+        for k, c in enumerate(center_idx):
+            i0 = max(0, c - fit_distance)
+            i1 = min(n_samples - 1, c + fit_distance)
+            out_slope[k], _, out_r2[k] = _linreg(x, traces[k], i0, i1 + 1)
+
+    def _fv_trough(y, start_idx, stop_idx):
+        """``find_peaks`` ``_fv_trough``: the deepest trough, or -1."""
+        window = np.asarray(y[start_idx:stop_idx], dtype=np.float64)
+        troughs, _ = find_peaks(-window)
+        if troughs.size == 0:
+            return -1
+        return start_idx + int(troughs[np.argmin(window[troughs])])
+
+    def _peaks_with_prominence(y, i0, i1, out_peaks, out_prominences):
+        """``find_peaks`` and ``peak_prominences`` ``_peaks_with_prominence``."""
+        window = np.asarray(y[i0:i1], dtype=np.float64)
+        peaks, _ = find_peaks(window)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")  # plateaus of zero prominence
+            prominences = peak_prominences(window, peaks, wlen=None)[0]
+        n = peaks.size
+        out_peaks[:n] = i0 + peaks
+        out_prominences[:n] = prominences
+        return n
+
+    def _ps_peak(y, i0, i1, min_prominence):
+        """``find_peaks(prominence=...)`` ``_ps_peak``: the most prominent peak, or -1."""
+        window = np.asarray(y[i0:i1], dtype=np.float64)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            peaks, props = find_peaks(window, prominence=min_prominence)
+        if peaks.size == 0:
+            return -1
+        return i0 + int(peaks[np.argmax(props["prominences"])])
+
+    def _fv_kernel(traces, start_idx, stop_idx, out_idx):
+        for k in range(traces.shape[0]):
+            out_idx[k] = _fv_trough(traces[k], start_idx, stop_idx)
+
+    def _ps_kernel(traces, i0, i1, min_prominence, out_idx):
+        for k in range(traces.shape[0]):
+            out_idx[k] = _ps_peak(traces[k], i0[k], i1[k], min_prominence)
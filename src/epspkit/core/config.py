@@ -1,11 +1,11 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 from typing import Any, Literal, Sequence
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SmoothingConfig:
     """
     Configuration for optional trace smoothing.
@@ -14,6 +14,8 @@ class SmoothingConfig:
       - method="none" → no smoothing unless explicitly enabled
       - window_size / polyorder chosen to be reasonable for EPSP traces
       - cutoff/order for a generic low-pass if you want Butterworth
+
+    Frozen (and therefore hashable) so a policy can key smoothing caches.
     """
     method: Literal["none", "moving_average", "savgol", "butter_lowpass"] = "none"
     window_size: int = 15      # used by moving_average and savgol
@@ -21,8 +23,18 @@ class SmoothingConfig:
     cutoff: float = 2000.0     # Hz, for butter_lowpass
     order: int = 3             # filter order for butter_lowpass
 
+    # Python 3.10.0 unpickles slotted instances with setattr, which a frozen
+    # dataclass rejects (bpo-45897), so the state is restored explicitly.
+    # Later releases install equivalent methods of their own.
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, f.name) for f in fields(self))
+
+    def __setstate__(self, state: tuple) -> None:
+        for f, value in zip(fields(self), state):
+            object.__setattr__(self, f.name, value)
 
-@dataclass
+
+@dataclass(slots=True)
 class FeatureConfig:
     """
     Per-feature configuration.
@@ -36,7 +48,7 @@ class FeatureConfig:
     smoothing: SmoothingConfig | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class TransformConfig:
     """
     Per-transform configuration.
@@ -48,10 +60,27 @@ class TransformConfig:
     params: dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class IOConfig:
     """
     I/O and basic acquisition configuration for a pipeline run.
+
+    n_jobs : worker processes for running input files concurrently
+             (1 = serial, None or -1 = one per CPU). Ignored when
+             render_plots is True, since interactive figures need the
+             main process.
+    n_workers : threads for running input files concurrently when n_jobs
+                is 1 (1 = serial, None or -1 = one per CPU). Plots are
+                drawn on the calling thread once all files are analyzed.
+    output_format : "xlsx" (one workbook per file), "xlsx_single" (one
+                    results.xlsx, sheets prefixed r1_, r2_, ... with a
+                    "recordings" sheet naming each file stem) or
+                    "parquet" (one directory of Parquet tables per file;
+                    needs pyarrow). With n_jobs > 1, per-file outputs are
+                    also written in parallel.
+    precision : floating precision of voltage data ("fp32" or "fp64").
+                ABF samples come from a 16-bit ADC, so float32 holds them
+                exactly at half the memory traffic. Time stays float64.
     """
     input_paths: Sequence[str] = field(default_factory=list)
     output_path: Path | None = None
@@ -61,8 +90,12 @@ class IOConfig:
     write_results: bool = True
     write_plots: bool = False
     render_plots: bool = True
+    n_jobs: int | None = 1
+    n_workers: int | None = 1
+    output_format: Literal["xlsx", "xlsx_single", "parquet"] = "xlsx"
+    precision: Literal["fp32", "fp64"] = "fp32"
 
-@dataclass
+@dataclass(slots=True)
 class VizConfig:
     """
     Configuration for visualization settings.
@@ -73,8 +106,9 @@ class VizConfig:
     style: str = "default" # Matplotlib style
     color_map: str = "viridis"
     smoothing: SmoothingConfig | None = None
+    cursor: bool = False # render() adds a blitted vertical cursor across the axes
 
-@dataclass
+@dataclass(slots=True)
 class PipelineConfig:
     """
     Top-level configuration for an analysis pipeline.
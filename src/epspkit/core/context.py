@@ -1,12 +1,81 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import InitVar, dataclass, field
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from epspkit.core.config import PipelineConfig
 
+
+def split_traces(
+    abf_df: pd.DataFrame,
+    value_col: str = "mean",
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Order a long (stim_intensity, time) frame into contiguous per-stim runs.
+
+    Rows are ordered once with a lexsort and run boundaries come from
+    ``np.unique``, so no pandas grouping or hashing is involved. Traces may
+    differ in length. A frame already in (stim_intensity, time) order, as
+    ``average_sweeps`` produces, skips the sort and returns zero-copy column
+    views.
+
+    Returns
+    -------
+    stims
+        Sorted unique stimulus intensities, shape (n_stims,).
+    bounds
+        Run offsets, shape (n_stims + 1,); stim ``k`` spans
+        ``bounds[k]:bounds[k + 1]``.
+    time
+        Time column in run order.
+    values
+        ``value_col`` in run order.
+    """
+    stim = abf_df["stim_intensity"].to_numpy()
+    time = abf_df["time"].to_numpy()
+    values = abf_df[value_col].to_numpy()
+    new_stim = stim[1:] != stim[:-1]
+    if (stim[1:] >= stim[:-1]).all() and (new_stim | (time[1:] >= time[:-1])).all():
+        # Already sorted: the stable lexsort would be the identity.
+        starts = np.flatnonzero(np.r_[stim.size > 0, new_stim])
+        return stim[starts], np.r_[starts, stim.size], time, values
+    order = np.lexsort((time, stim))
+    stims, starts = np.unique(stim[order], return_index=True)
+    bounds = np.r_[starts, stim.size]
+    return stims, bounds, time[order], values[order]
+
+
+def stack_traces(
+    abf_df: pd.DataFrame,
+    value_col: str = "mean",
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Reshape a long (stim_intensity, time) frame to one row per stim.
+
+    Returns
+    -------
+    stims
+        Sorted unique stimulus intensities, shape (n_stims,).
+    x
+        Time axis shared by every stim, shape (n_time,).
+    traces
+        ``value_col`` per stim, shape (n_stims, n_time).
+    """
+    stims, bounds, time, values = split_traces(abf_df, value_col)
+    n_stims = stims.size
+    n_time = time.size // n_stims if n_stims else 0
+    if n_stims == 0 or np.any(np.diff(bounds) != n_time):
+        raise ValueError("Expected one equal-length trace per stim_intensity.")
+
+    times = time.reshape(n_stims, n_time)
+    if not (times == times[0]).all():
+        raise ValueError("Expected every stim trace to share one time grid.")
+    return stims, times[0], values.reshape(n_stims, n_time)
+
+
 @dataclass
 class RecordingContext:
     """
@@ -17,7 +86,9 @@ class RecordingContext:
     tidy : pd.DataFrame
         Full tidy time-series (columns: time, voltage, sweep, intensity, etc.).
     averaged : pd.DataFrame
-        Sweep-averaged signal, usually one row per timepoint.
+        Sweep-averaged signal, usually one row per timepoint. Assigning it
+        goes through ``set_averaged``, so the matrix layout and caches below
+        never describe a previous frame.
     fs : float
         Sampling rate in Hz.
     metadata : dict[str, Any]
@@ -27,18 +98,118 @@ class RecordingContext:
     pipeline_cfg : PipelineConfig | None
         Optionally attached by the pipeline to make config discoverable
         to features/utilities that only receive a RecordingContext.
+    averaged_matrix : np.ndarray | None
+        ``averaged["mean"]`` laid out as (n_stims, n_time), one row per stim.
+        Kept in sync with ``averaged`` by ``set_averaged``; None when the
+        averaged traces do not share a single time grid. For sorted averaged
+        data it is a view of the ``mean`` column, so treat it as read-only.
+    time_axis : np.ndarray | None
+        Time (s) of each column of ``averaged_matrix``.
+    stim_axis : np.ndarray | None
+        Stimulus intensity of each row of ``averaged_matrix``.
+    dtype : np.dtype | None
+        Floating dtype for voltage data (tidy voltage, averaged mean/sem and
+        ``averaged_matrix``). ``np.float32`` halves memory traffic and is
+        ample for 16-bit ADC recordings; reported feature scalars are always
+        float64. None keeps whatever the loader produced.
+    smoothed_cache : dict[tuple, np.ndarray]
+        Arrays derived from ``averaged_matrix`` (smoothed traces and their
+        gradient), keyed by ``(kind, SmoothingConfig, fs)`` so consumers
+        sharing a smoothing policy compute each one only once. Cleared by
+        ``set_averaged``; treat the cached arrays as read-only.
+    _averaged_valid : bool
+        Whether ``averaged`` reflects the current ``tidy``. Set by
+        ``set_averaged`` and cleared by ``set_tidy``, so the pipeline only
+        re-averages after a transform changed the sweeps. Read it through
+        ``averaged_is_current``.
+    version : int
+        Counter bumped by every setter (``set_tidy``, ``set_averaged``,
+        ``add_result``), so plots can tell whether a figure they built
+        still reflects the context. Call ``bump_version`` after mutating
+        attributes directly.
     """
 
     tidy: pd.DataFrame
-    averaged: pd.DataFrame
+    averaged: InitVar[pd.DataFrame]
     fs: float
     metadata: dict[str, Any] = field(default_factory=dict)
     results: dict[str, dict[str, Any]] = field(default_factory=dict)
     pipeline_cfg: PipelineConfig | None = None  # attached by pipeline
+    averaged_matrix: np.ndarray | None = None
+    time_axis: np.ndarray | None = None
+    stim_axis: np.ndarray | None = None
+    dtype: np.dtype | None = None
+    smoothed_cache: dict[tuple, np.ndarray] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    _averaged_valid: bool = field(default=False, init=False, repr=False, compare=False)
+    version: int = field(default=0, init=False, repr=False, compare=False)
+    _stim_unique: np.ndarray | None = field(default=None, init=False, repr=False, compare=False)
+    _averaged: pd.DataFrame = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self, averaged: pd.DataFrame) -> None:
+        self._averaged = averaged
+        # A context built with averaged data is taken as already averaged.
+        if averaged is not None and not averaged.empty:
+            if self.averaged_matrix is None:
+                self.set_averaged(averaged)
+            self._averaged_valid = True
+
+    def set_tidy(self, tidy: pd.DataFrame) -> None:
+        """Replace the tidy sweeps, marking ``averaged`` as out of date."""
+        self.tidy = tidy
+        self._averaged_valid = False
+        self.bump_version()
+
+    def set_averaged(self, averaged: pd.DataFrame) -> None:
+        """Store sweep-averaged data along with its per-stim matrix layout."""
+        self._averaged = averaged
+        self._averaged_valid = True
+        self.bump_version()
+        self.averaged_matrix = self.time_axis = self.stim_axis = None
+        self._stim_unique = None
+        self.smoothed_cache.clear()
+        if averaged is None or averaged.empty or "mean" not in averaged.columns:
+            return
+        try:
+            stims, x, traces = stack_traces(averaged)
+        except ValueError:
+            return
+        if self.dtype is not None:
+            traces = traces.astype(self.dtype, copy=False)
+        self.stim_axis, self.time_axis, self.averaged_matrix = stims, x, traces
+
+    @property
+    def averaged_is_current(self) -> bool:
+        """Whether ``averaged`` was set after the last change to ``tidy``."""
+        return self._averaged_valid
+
+    @property
+    def stim_unique(self) -> np.ndarray:
+        """
+        Distinct stimulus intensities of ``averaged``, in ascending order.
+
+        ``stim_axis`` when the matrix layout exists, otherwise one hash scan
+        of the ``stim_intensity`` column (only the few distinct values are
+        sorted), cached until ``set_averaged``.
+        """
+        if self.stim_axis is not None:
+            return self.stim_axis
+        if self._stim_unique is None:
+            averaged = self.averaged
+            if averaged is None or "stim_intensity" not in averaged.columns:
+                return np.empty(0)
+            self._stim_unique = np.sort(np.asarray(pd.unique(averaged["stim_intensity"])))
+        return self._stim_unique
 
     def add_result(self, feature_name: str, result: dict[str, Any]) -> None:
         """Add or update results from a feature analyzer."""
         self.results[feature_name] = result
+        self.bump_version()
+
+    def bump_version(self) -> None:
+        """Mark the context as changed, invalidating figures built from it."""
+        self.version += 1
 
     def get_result(self, feature_name: str) -> dict[str, Any] | None:
         """Retrieve results for a given feature, or None if missing."""
@@ -70,3 +241,12 @@ class RecordingContext:
             stim_intensities=stim_intensities,
             repnum=repnum
         )
+
+
+# Defined after the decorator so dataclass does not take the property for the
+# field's default; ``averaged`` itself is an InitVar stored in ``_averaged``.
+RecordingContext.averaged = property(
+    lambda self: self._averaged,
+    RecordingContext.set_averaged,
+    doc="Sweep-averaged signal; assigning it calls ``set_averaged``.",
+)
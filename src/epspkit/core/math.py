@@ -1,19 +1,91 @@
+from functools import lru_cache
+
 import numpy as np
 from scipy.signal import (
+    savgol_coeffs,
     savgol_filter,
     butter,
-    filtfilt,
+    sosfiltfilt,
     find_peaks as _find_peaks,
     peak_prominences as _peak_prominences,
 )
-from scipy.ndimage import uniform_filter1d
+from scipy.ndimage import convolve1d, uniform_filter1d
+
+from epspkit.core._kernels import (
+    NUMBA_AVAILABLE,
+    get_num_threads,
+    _as_traces,
+    _fir_rows,
+    _gradient_rows,
+    _linreg,
+    _lttb,
+    _peaks_with_prominence,
+)
 
 
-def gradient(y: np.ndarray, x: np.ndarray):
-    return np.gradient(y, x)
+def gradient(y: np.ndarray, x: np.ndarray, axis: int = -1):
+    # Sampled traces are uniform in time, which takes the cheaper
+    # uniform-spacing path; gapped grids (e.g. a mid-trace crop) do not.
+    x = np.asarray(x, dtype=np.float64)
+    if x.size >= 2:
+        dt = (x[-1] - x[0]) / (x.size - 1)
+        if dt > 0 and np.allclose(np.diff(x), dt, rtol=1e-6, atol=0.0):
+            y = np.moveaxis(np.asarray(y), axis, -1)
+            return np.moveaxis(gradient_uniform(y, dt), -1, axis)
+    return np.gradient(y, x, axis=axis)
+
+def gradient_uniform(y: np.ndarray, dt: float):
+    # np.gradient for a uniformly sampled trace (last axis): skips the
+    # per-sample spacing terms that the non-uniform path computes.
+    y = np.asarray(y)
+    if NUMBA_AVAILABLE and y.ndim in (1, 2) and y.shape[-1] >= 2:
+        # Compiled single pass per row, no difference temporaries.
+        traces = _as_traces(y.reshape(-1, y.shape[-1]))
+        g = np.empty(traces.shape, dtype=np.float64)
+        _gradient_rows(traces, 1.0 / dt, g)
+        return g.reshape(y.shape)
+    g = np.empty(y.shape, dtype=np.result_type(y.dtype, np.float64))
+    g[..., 1:-1] = (y[..., 2:] - y[..., :-2]) * (0.5 / dt)
+    g[..., 0] = (y[..., 1] - y[..., 0]) / dt
+    g[..., -1] = (y[..., -1] - y[..., -2]) / dt
+    return g
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int):
+    # Largest-Triangle-Three-Buckets downsampling of a 1D trace to n_out
+    # points for display. Traces already that short, or with NaN gaps
+    # (which a line plot shows as breaks), are returned as-is.
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = _as_traces(y)
+    n = x.size
+    if n_out < 3 or n <= n_out or not np.isfinite(y).all():
+        return x, y
+    if NUMBA_AVAILABLE:
+        idx = np.empty(n_out, dtype=np.int64)
+        _lttb(x, y, idx)
+        return x[idx], y[idx]
+    # Same buckets in NumPy: one vectorized area scan per bucket.
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    yf = y.astype(np.float64, copy=False)
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt_hi = edges[i + 2] if i + 2 < edges.size else n
+        avg_x = x[hi:nxt_hi].mean()
+        avg_y = yf[hi:nxt_hi].mean()
+        area = np.abs((x[a] - avg_x) * (yf[lo:hi] - yf[a]) - (x[a] - x[lo:hi]) * (avg_y - yf[a]))
+        a = idx[i + 1] = lo + int(np.argmax(area))
+    return x[idx], y[idx]
 
 def auc(x: np.ndarray, y: np.ndarray):
-    return np.trapz(y, x)
+    return np.trapezoid(y, x)
+
+def auc_uniform(y: np.ndarray, dt: float):
+    # Trapezoid rule on a uniform grid as one reduction (no np.diff(x) temporary).
+    y = np.asarray(y)
+    return dt * (y.sum(axis=-1) - 0.5 * (y[..., 0] + y[..., -1]))
 
 def logistic(x, A, x0, k):
     return A / (1 + np.exp(-(x - x0) / k))
@@ -24,25 +96,81 @@ def exp_saturation(x, A, k):
 def baseline(y):
     return np.mean(y), np.std(y)
 
-def moving_average(y: np.ndarray, window_size: int):
-    return uniform_filter1d(y, size=window_size, mode='nearest')
+def moving_average(y: np.ndarray, window_size: int, axis: int = -1):
+    # uniform_filter1d keeps a running sum in C: O(n) for any window, same
+    # length as y, nearest-edge padding. A NumPy cumsum version measured ~3x
+    # slower (pad + cumsum + difference passes) with identical output.
+    return uniform_filter1d(y, size=window_size, mode='nearest', axis=axis)
 
 def rms(y: np.ndarray):
     return np.sqrt(np.mean(y**2))
 
-def savgol(y: np.ndarray, window_size: int, polyorder: int):
-    return savgol_filter(y, window_size, polyorder)
+@lru_cache(maxsize=16)
+def savgol_coeffs_cached(window_size: int, polyorder: int):
+    coeffs = savgol_coeffs(window_size, polyorder)
+    coeffs.flags.writeable = False
+    return coeffs
 
-def butter_lowpass(y: np.ndarray, cutoff: float, fs: float, order: int = 3):
-    b, a = butter(order, cutoff, btype='low', fs=fs)
-    return filtfilt(b, a, y)
+@lru_cache(maxsize=16)
+def _savgol_edge_projections(window_size: int, polyorder: int):
+    # Least-squares hat matrix of a degree-polyorder fit over one window.
+    # Its first/last half rows give savgol_filter's mode="interp" edge values.
+    half = window_size // 2
+    vander = np.vander(np.arange(window_size, dtype=np.float64), polyorder + 1)
+    hat = vander @ np.linalg.pinv(vander)
+    left = np.ascontiguousarray(hat[:half].T)
+    right = np.ascontiguousarray(hat[window_size - half:].T)
+    left.flags.writeable = right.flags.writeable = False
+    return left, right
+
+def savgol(y: np.ndarray, window_size: int, polyorder: int, axis: int = -1):
+    # Same output as savgol_filter(mode="interp"), but the filter coefficients
+    # and edge-fit projections are built once per (window_size, polyorder).
+    y = np.asarray(y)
+    if y.shape[axis] < window_size:
+        return savgol_filter(y, window_size, polyorder, axis=axis)
+    if y.dtype not in (np.float32, np.float64):
+        y = y.astype(np.float64)
+
+    coeffs = savgol_coeffs_cached(window_size, polyorder)
+    if (
+        NUMBA_AVAILABLE and y.ndim == 2 and axis in (-1, 1)
+        and y.shape[0] > 1 and get_num_threads() > 1
+    ):
+        # convolve1d runs on one core; the compiled FIR spreads the stim
+        # rows across cores. Single-threaded it is no faster, so it is only
+        # used when there are threads to spread over.
+        y = np.ascontiguousarray(y)
+        out = np.empty_like(y)
+        _fir_rows(y, coeffs, out)
+    else:
+        out = convolve1d(y, coeffs, axis=axis, mode="constant")
+    half = window_size // 2
+    if half:
+        left, right = _savgol_edge_projections(window_size, polyorder)
+        y_t = np.moveaxis(y, axis, -1)
+        out_t = np.moveaxis(out, axis, -1)
+        out_t[..., :half] = y_t[..., :window_size] @ left
+        out_t[..., -half:] = y_t[..., -window_size:] @ right
+    return out
+
+@lru_cache(maxsize=64)
+def _butter_sos(order: int, cutoff: float, fs: float):
+    # Filter design depends only on these three values; reuse it across calls.
+    # Second-order sections stay stable at high orders / low cutoffs, where
+    # (b, a) polynomials lose precision, and pad like filtfilt does.
+    return butter(order, cutoff, btype='low', fs=fs, output='sos')
+
+def butter_lowpass(y: np.ndarray, cutoff: float, fs: float, order: int = 3, axis: int = -1):
+    sos = _butter_sos(int(order), float(cutoff), float(fs))
+    return sosfiltfilt(sos, y, axis=axis)
 
 def linear_fit(x: np.ndarray, y: np.ndarray):
-    m, b = np.polyfit(x, y, 1)
-    y_fit = m * x + b
-    ss_res = np.sum((y - y_fit) ** 2)
-    ss_tot = np.sum((y - y.mean()) ** 2)
-    r2 = 1.0 - ss_res / ss_tot if ss_tot > 0 else np.nan
+    # Closed-form degree-1 least squares; same result as np.polyfit(x, y, 1)
+    # without building a Vandermonde matrix.
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    y = np.ascontiguousarray(y, dtype=np.float64)
+    m, b, r2 = _linreg(x, y, 0, x.size)
     return float(m), float(b), float(r2)
 
 def find_peaks(y: np.ndarray, **kwargs):
@@ -51,6 +179,19 @@ def find_peaks(y: np.ndarray, **kwargs):
 def peak_prominences(y: np.ndarray, peaks: np.ndarray):
     return _peak_prominences(y, peaks)
 
+def find_peaks_with_prominence(y: np.ndarray):
+    """
+    Peaks of a 1D trace and their prominences in one compiled pass.
+
+    Equivalent to ``find_peaks(y, prominence=0)`` returning
+    ``(peaks, props["prominences"])``, without SciPy's per-call overhead.
+    """
+    y = _as_traces(y)
+    peaks = np.empty(y.size // 2 + 1, dtype=np.int64)
+    prominences = np.empty(y.size // 2 + 1, dtype=np.float64)
+    n = _peaks_with_prominence(y, 0, y.size, peaks, prominences)
+    return peaks[:n], prominences[:n]
+
 def to_samples(time_ms: float, fs: float):
     return int(round((time_ms / 1000.0) * fs))
 
@@ -0,0 +1,101 @@
+"""
+Smoothing shared by feature analyzers and plots.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from epspkit.core.config import SmoothingConfig
+from epspkit.core.context import RecordingContext
+from epspkit.core import math as emath
+
+
+class SmoothingMixin:
+    """
+    Trace smoothing for classes holding a ``smoothing: SmoothingConfig``.
+
+    Used by both ``Feature`` and ``Plot``, so a feature and a plot with the
+    same policy filter traces identically and share the context cache.
+    """
+
+    smoothing: SmoothingConfig
+
+    def smoothed_traces(self, context: RecordingContext) -> np.ndarray:
+        """
+        ``context.averaged_matrix`` smoothed with this instance's policy.
+
+        The result is cached on the context under ``(self.smoothing, fs)``;
+        frozen configs hash by value, so every feature or plot with the same
+        policy reuses one filtered copy. Do not modify the returned array.
+        """
+        if context.averaged_matrix is None:
+            raise ValueError("RecordingContext has no averaged_matrix to smooth.")
+        key = ("traces", self.smoothing, context.fs)
+        traces = context.smoothed_cache.get(key)
+        if traces is None:
+            traces = np.ascontiguousarray(
+                self.apply_smoothing(context.averaged_matrix, fs=context.fs, axis=1)
+            )
+            context.smoothed_cache[key] = traces
+        return traces
+
+    def smoothed_gradient(self, context: RecordingContext) -> np.ndarray:
+        """
+        Time derivative (mV/s) of ``smoothed_traces(context)``, row by row.
+
+        Shares the context cache, so the stack is differentiated once per
+        smoothing policy however many consumers ask for it.
+        """
+        key = ("gradient", self.smoothing, context.fs)
+        dy = context.smoothed_cache.get(key)
+        if dy is None:
+            dy = emath.gradient(self.smoothed_traces(context), context.time_axis)
+            context.smoothed_cache[key] = dy
+        return dy
+
+    def apply_smoothing(self, y, fs: float | None = None, axis: int = -1):
+        """
+        Apply the configured smoothing method to a trace y.
+
+        If method == "none", returns y unchanged.
+
+        Parameters
+        ----------
+        y
+            1D trace, or a 2D stack of traces (e.g. one row per stim).
+        fs
+            Sampling rate in Hz. Required for Butterworth smoothing.
+        axis
+            Time axis of y. Every other axis is smoothed independently.
+        """
+        cfg = self.smoothing
+
+        if cfg.method == "none":
+            return y
+
+        y_arr = np.asarray(y)
+
+        if cfg.method == "moving_average":
+            return emath.moving_average(y_arr, cfg.window_size, axis=axis)
+
+        if cfg.method == "savgol":
+            window = cfg.window_size
+            poly = cfg.polyorder
+
+            # enforce odd window and basic validity
+            if window % 2 == 0:
+                window += 1
+            if window <= poly:
+                raise ValueError(
+                    f"Savgol requires window_size > polyorder "
+                    f"(got window_size={window}, polyorder={poly})."
+                )
+
+            return emath.savgol(y_arr, window, poly, axis=axis)
+
+        if cfg.method == "butter_lowpass":
+            if fs is None:
+                raise ValueError("Butterworth smoothing requires a sampling rate fs.")
+            return emath.butter_lowpass(y_arr, cfg.cutoff, fs, order=cfg.order, axis=axis)
+
+        raise ValueError(f"Unknown smoothing method: {cfg.method}")
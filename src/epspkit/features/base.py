@@ -1,23 +1,21 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any
-
-import numpy as np
 
 from epspkit.core.config import FeatureConfig, SmoothingConfig
 from epspkit.core.context import RecordingContext
-from epspkit.core import math as emath
+from epspkit.core.smoothing import SmoothingMixin
 
 
-class Feature(ABC):
+class Feature(SmoothingMixin, ABC):
     """
     Base class for all epspkit feature analyzers.
 
     Subclasses should:
       - implement `run(context)` to compute their metrics
       - read config from `self.config.params`
-      - optionally call `self.apply_smoothing(y, fs=context.fs)`
+      - optionally call `self.apply_smoothing(y, fs=context.fs)`, or
+        `self.smoothed_traces(context)` for the shared per-stim matrix
     """
 
     def __init__(self, config: FeatureConfig, effective_smoothing: SmoothingConfig | None = None):
@@ -54,48 +52,3 @@ class Feature(ABC):
     def run(self, context: RecordingContext) -> RecordingContext:
         """Perform feature extraction on the given recording context."""
         raise NotImplementedError
-
-    def apply_smoothing(self, y, fs: float | None = None):
-        """
-        Apply the configured smoothing method to a 1D trace y.
-
-        If method == "none", returns y unchanged.
-
-        Parameters
-        ----------
-        y
-            1D array-like trace.
-        fs
-            Sampling rate in Hz. Required for Butterworth smoothing.
-        """
-        cfg = self.smoothing
-
-        if cfg.method == "none":
-            return y
-
-        y_arr = np.asarray(y)
-
-        if cfg.method == "moving_average":
-            return emath.moving_average(y_arr, cfg.window_size)
-
-        if cfg.method == "savgol":
-            window = cfg.window_size
-            poly = cfg.polyorder
-
-            # enforce odd window and basic validity
-            if window % 2 == 0:
-                window += 1
-            if window <= poly:
-                raise ValueError(
-                    f"Savgol requires window_size > polyorder "
-                    f"(got window_size={window}, polyorder={poly})."
-                )
-
-            return emath.savgol(y_arr, window, poly)
-
-        if cfg.method == "butter_lowpass":
-            if fs is None:
-                raise ValueError("Butterworth smoothing requires a sampling rate fs.")
-            return emath.butter_lowpass(y_arr, cfg.cutoff, fs, order=cfg.order)
-
-        raise ValueError(f"Unknown smoothing method: {cfg.method}")
@@ -4,9 +4,9 @@ fEPSP slope feature extraction module.
 from __future__ import annotations
 
 from epspkit.features.base import Feature
-from epspkit.core.context import RecordingContext
+from epspkit.core.context import RecordingContext, split_traces, stack_traces
 from epspkit.core.config import FeatureConfig, SmoothingConfig
-from epspkit.core import math as emath
+from epspkit.core._kernels import _as_traces, _epsp_kernel
 from typing import Optional
 import pandas as pd
 import numpy as np
@@ -33,7 +33,15 @@ class EPSPFeature(Feature):
         """
         fv_res = context.get_result("fiber_volley")
         fs = context.fs  # Hz
-        epsp_df = self.calculate(context.averaged, fv_res, fs=fs)
+        if context.averaged_matrix is not None:
+            epsp_df = self.calculate_traces(
+                context.stim_axis,
+                context.time_axis,
+                self.smoothed_traces(context),
+                fv_res,
+            )
+        else:
+            epsp_df = self.calculate(context.averaged, fv_res, fs=fs)
         context.add_result(self.name, epsp_df)
         return context
 
@@ -43,8 +51,64 @@ class EPSPFeature(Feature):
         fv_df: Optional[pd.DataFrame],
         fs: float | None = None,
     ) -> pd.DataFrame:
+        try:
+            stims, x, traces = stack_traces(abf_df)
+        except ValueError:
+            pass  # ragged traces: smooth and search each stim on its own
+        else:
+            # Equal-length traces are filtered in one call over the stack.
+            traces = self.apply_smoothing(traces, fs=fs, axis=1)
+            return self.calculate_traces(stims, x, traces, fv_df)
+
+        stims, bounds, time, mean = split_traces(abf_df)
+        out = np.empty((6, stims.size))
+        for k, (s, e) in enumerate(zip(bounds[:-1], bounds[1:])):
+            y = self.apply_smoothing(mean[s:e], fs=fs)
+            out[:, k] = self._measure(time[s:e], y[np.newaxis, :])[:, 0]
+        return self._frame(stims, out, fv_df)
+
+    def calculate_traces(
+        self,
+        stims: np.ndarray,
+        x: np.ndarray,
+        traces: np.ndarray,
+        fv_df: Optional[pd.DataFrame],
+    ) -> pd.DataFrame:
+        """
+        EPSP analysis on smoothed traces laid out as (n_stims, n_time).
+
+        ``stims`` labels the rows of ``traces`` and ``x`` is their shared
+        time axis in seconds. Smoothing is the caller's job (see
+        ``Feature.smoothed_traces``) so it can be shared between features.
+        """
+        return self._frame(stims, self._measure(x, traces), fv_df)
+
+    def _measure(self, x: np.ndarray, traces: np.ndarray) -> np.ndarray:
+        """
+        (epsp_s, epsp_v, slope_mid_s, slope_mid_v, slope, r2) rows, one
+        column per row of ``traces``, on the shared time axis ``x``.
+        """
         t0, t1 = [v / 1000.0 for v in self.window_ms]
-        results = []
+        # One row per stim on a shared time axis, so the kernel walks rows
+        # instead of pandas groups.
+        x = np.ascontiguousarray(x, dtype=np.float64)
+        traces = _as_traces(traces)
+        start_idx, stop_idx = (int(i) for i in np.searchsorted(x, (t0, t1)))
+        if stop_idx <= start_idx:
+            raise ValueError(f"EPSPFeature window_ms {self.window_ms} contains no samples.")
+
+        out = np.empty((6, traces.shape[0]))
+        _epsp_kernel(x, traces, start_idx, stop_idx, self.fit_distance, *out)
+        return out
+
+    @staticmethod
+    def _frame(
+        stims: np.ndarray,
+        out: np.ndarray,
+        fv_df: Optional[pd.DataFrame],
+    ) -> pd.DataFrame:
+        """Result table from stacked ``_measure`` columns and the FV result."""
+        epsp_s, epsp_v, slope_mid_s, slope_mid_v, slope, r2 = out
         if fv_df is None or fv_df.empty:
             warnings.warn(
                 "Synaptic strength (fEPSP slope / fiber volley amplitude) cannot be calculated "
@@ -53,48 +117,24 @@ class EPSPFeature(Feature):
             )
             fv_df = None
 
-        for stim, g in abf_df.groupby("stim_intensity"):
-            x = g["time"].to_numpy()
-            # Smooth the raw mean once; avoid re-smoothing the pre-smoothed column.
-            y = self.apply_smoothing(g["mean"].to_numpy(), fs=fs)
-
-            start_idx = int(np.searchsorted(x, t0))
-            stop_idx = int(np.searchsorted(x, t1))
-            dy_full = emath.gradient(y, x)
-
-            epsp_segment = slice(start_idx, stop_idx)
-            slope_center_idx = start_idx + int(np.argmin(dy_full[epsp_segment]))
-            epsp_idx = start_idx + int(np.argmin(y[epsp_segment]))
-
-            if fv_df is not None and (fv_df.stim_intensity == stim).any():
-                fv_row = fv_df.loc[fv_df.stim_intensity == stim].iloc[0]
-                fv_amp = fv_row["fv_amp"]
-            else:
-                fv_amp = np.nan
-
-            epsp_s, epsp_v = x[epsp_idx], y[epsp_idx]
-            epsp_amp = abs(epsp_v)
-
-            i0 = max(0, slope_center_idx - self.fit_distance)
-            i1 = min(len(y) - 1, slope_center_idx + self.fit_distance)
-            t_win = x[i0:i1 + 1] - x[slope_center_idx]
-            v_win = y[i0:i1 + 1]
-            m, b = np.polyfit(t_win, v_win, 1)
-            y_pred = m * t_win + b
-            ss_res = np.sum((v_win - y_pred) ** 2)
-            ss_tot = np.sum((v_win - v_win.mean()) ** 2)
-            r2 = 1 - ss_res / ss_tot
-
-            results.append({
-                "stim_intensity": stim,
-                "epsp_s": float(epsp_s),
-                "epsp_v": float(epsp_v),
-                "slope_mid_s": float(x[slope_center_idx]),
-                "slope_mid_v": float(y[slope_center_idx]),
-                "epsp_amp": float(epsp_amp),
-                "epsp_to_fv": float((abs(m) / 1000.0) / fv_amp) if fv_amp and m else np.nan,
-                "epsp_slope": float(abs(m) / 1000.0), # mV/ms
-                "epsp_r2": float(r2),
-            })
+        epsp_slope = np.abs(slope) / 1000.0  # mV/ms
+        # First FV row per stim, looked up in O(1) instead of a mask per stim.
+        fv_map: dict = {}
+        if fv_df is not None:
+            for stim, amp in zip(fv_df["stim_intensity"].to_numpy(), fv_df["fv_amp"].to_numpy()):
+                fv_map.setdefault(stim, amp)
+        fv_amp = np.array([fv_map.get(stim, np.nan) for stim in stims], dtype=np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            epsp_to_fv = np.where((fv_amp != 0) & (slope != 0), epsp_slope / fv_amp, np.nan)
 
-        return pd.DataFrame(results)
+        return pd.DataFrame({
+            "stim_intensity": stims,
+            "epsp_s": epsp_s,
+            "epsp_v": epsp_v,
+            "slope_mid_s": slope_mid_s,
+            "slope_mid_v": slope_mid_v,
+            "epsp_amp": np.abs(epsp_v),
+            "epsp_to_fv": epsp_to_fv,
+            "epsp_slope": epsp_slope,
+            "epsp_r2": r2,
+        }, copy=False)
@@ -4,9 +4,9 @@ Fiber volley feature detection implemented as an Analyzer subclass.
 from __future__ import annotations
 
 from epspkit.features.base import Feature
-from epspkit.core.context import RecordingContext
+from epspkit.core.context import RecordingContext, split_traces, stack_traces
 from epspkit.core.config import FeatureConfig, SmoothingConfig
-from epspkit.core import math as emath
+from epspkit.core._kernels import _as_traces, _fv_kernel, _fv_trough
 from typing import Optional
 import pandas as pd
 import numpy as np
@@ -24,45 +24,75 @@ class FiberVolleyFeature(Feature):
 
     def run(self, context: RecordingContext) -> RecordingContext:
         fs = context.fs  # Hz
-        fv_df = self.calculate(context.averaged, fs=fs)
+        if context.averaged_matrix is not None:
+            fv_df = self.calculate_traces(
+                context.stim_axis,
+                context.time_axis,
+                self.smoothed_traces(context),
+            )
+        else:
+            fv_df = self.calculate(context.averaged, fs=fs)
         context.add_result(self.name, fv_df)
         return context
 
     def calculate(self, abf_df: pd.DataFrame, fs: float | None = None) -> pd.DataFrame:
-        t0, t1 = [v / 1000.0 for v in self.window_ms]
-        results = []
+        try:
+            stims, x, traces = stack_traces(abf_df)
+        except ValueError:
+            pass  # ragged traces: smooth and search each stim on its own
+        else:
+            # Equal-length traces are filtered in one call over the stack.
+            return self.calculate_traces(stims, x, self.apply_smoothing(traces, fs=fs, axis=1))
 
-        for stim, g in abf_df.groupby("stim_intensity"):
-            x = g["time"].to_numpy()
+        stims, bounds, time, mean = split_traces(abf_df)
+        fv_s = np.full(stims.size, np.nan)
+        fv_v = np.full(stims.size, np.nan)
+        for k, (s, e) in enumerate(zip(bounds[:-1], bounds[1:])):
+            x = time[s:e]
             # Smooth the raw mean once; avoid re-smoothing the pre-smoothed column.
-            y = self.apply_smoothing(g["mean"].to_numpy(), fs=fs)
+            y = _as_traces(self.apply_smoothing(mean[s:e], fs=fs))
+            fv_idx = _fv_trough(y, *self._window(x))
+            if fv_idx >= 0:
+                fv_s[k], fv_v[k] = x[fv_idx], y[fv_idx]
+        return self._frame(stims, fv_s, fv_v)
 
-            start_idx = int(np.searchsorted(x, t0))
-            stop_idx = int(np.searchsorted(x, t1))
-            y_w = y[start_idx:stop_idx]
+    def calculate_traces(
+        self,
+        stims: np.ndarray,
+        x: np.ndarray,
+        traces: np.ndarray,
+    ) -> pd.DataFrame:
+        """Fiber volley on smoothed traces laid out as (n_stims, n_time)."""
+        # Every row shares x, so the window is resolved once for all stims,
+        # and the rows are searched in parallel outside the GIL.
+        start_idx, stop_idx = self._window(x)
+        traces = _as_traces(traces)
+        fv_idx = np.empty(stims.size, dtype=np.int64)
+        _fv_kernel(traces, start_idx, stop_idx, fv_idx)
 
-            fv_idx = None
-            # FV is negative-going: look for troughs (peaks on -y).
-            neg_peaks, neg_props = emath.find_peaks(-y_w)
-            if neg_peaks.size:
-                if "prominences" in neg_props:
-                    fv_min_rel = neg_peaks[np.argmax(neg_props["prominences"])]
-                else:
-                    fv_min_rel = neg_peaks[np.argmin(y_w[neg_peaks])]
-                fv_idx = start_idx + fv_min_rel
-        
+        # Gather every trough with one fancy index instead of a row loop.
+        found = fv_idx >= 0
+        idx = np.where(found, fv_idx, 0)
+        fv_s = np.where(found, np.asarray(x, dtype=np.float64)[idx], np.nan)
+        fv_v = np.where(found, traces[np.arange(stims.size), idx], np.nan).astype(np.float64)
+        return self._frame(stims, fv_s, fv_v)
 
-            fv_amp = fv_v = fv_s = np.nan
-            if fv_idx is not None:
-                fv_s, fv_v = x[fv_idx], y[fv_idx]
-            if np.isfinite(fv_v):
-                fv_amp = abs(fv_v)
+    def _window(self, x: np.ndarray) -> tuple[int, int]:
+        """Sample range [start_idx, stop_idx) of window_ms on time axis x."""
+        t0, t1 = [v / 1000.0 for v in self.window_ms]
+        start_idx, stop_idx = np.searchsorted(x, (t0, t1))
+        return int(start_idx), int(stop_idx)
 
-            results.append({
-                "stim_intensity": stim,
-                "fv_amp": fv_amp,
-                "fv_s": fv_s,
-                "fv_v": fv_v,
-            })
+    @staticmethod
+    def _frame(stims: np.ndarray, fv_s: np.ndarray, fv_v: np.ndarray) -> pd.DataFrame:
+        """
+        Result table from per-stim trough times and voltages (NaN: no trough).
 
-        return pd.DataFrame(results)
+        FV is negative-going, so its amplitude is the trough depth.
+        """
+        return pd.DataFrame({
+            "stim_intensity": stims,
+            "fv_amp": np.abs(fv_v),
+            "fv_s": fv_s,
+            "fv_v": fv_v,
+        }, copy=False)
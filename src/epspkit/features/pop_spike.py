@@ -4,9 +4,9 @@ Module for detecting population spike features.
 from __future__ import annotations
 
 from epspkit.features.base import Feature
-from epspkit.core.context import RecordingContext
+from epspkit.core.context import RecordingContext, split_traces, stack_traces
 from epspkit.core.config import FeatureConfig, SmoothingConfig
-from epspkit.core import math as emath
+from epspkit.core._kernels import _as_traces, _ps_kernel, _ps_peak
 import pandas as pd
 import numpy as np
 
@@ -38,70 +38,128 @@ class PopSpikeFeature(Feature):
         epsp_df = context.get_result("epsp")
         if epsp_df is None or epsp_df.empty:
             raise ValueError("EPSPFeature result is required for PopSpikeFeature.")
-        ps_df = self.calculate(context.averaged, epsp_df, fs=fs)
+        if context.averaged_matrix is not None:
+            ps_df = self.calculate_traces(
+                context.stim_axis,
+                context.time_axis,
+                self.smoothed_traces(context),
+                epsp_df,
+            )
+        else:
+            ps_df = self.calculate(context.averaged, epsp_df, fs=fs)
         context.add_result(self.name, ps_df)
         return context
 
     def calculate(
-    self,
-    abf_df: pd.DataFrame,
-    epsp_df: pd.DataFrame,
-    fs: float | None = None,
-) -> pd.DataFrame:
-
-        results = []
-
-        for stim, g in abf_df.groupby("stim_intensity"):
-            x = g["time"].to_numpy()
-            y = self.apply_smoothing(g["mean"].to_numpy(), fs=fs)
-
-            epsp_row = epsp_df.loc[epsp_df.stim_intensity == stim].iloc[0]
-            t_s = epsp_row["epsp_s"]
-            v_s = epsp_row["epsp_v"]
-
-            i0 = np.searchsorted(x, t_s)
-            i1 = np.searchsorted(x, t_s + self.ps_lag / 1000.0)
-
-            dy = emath.gradient(y, x)
-            y_w, dy_w = y[i0:i1], dy[i0:i1]
-
-            ps_idx = None
-
-            # ---- 1. True peak detection ----
-            peaks, props = emath.find_peaks(y_w, prominence=self.prominence)
-            if peaks.size:
-                ps_rel = peaks[np.argmax(props["prominences"])]
-                ps_idx = i0 + ps_rel
-
-            ps_amp = ps_s = ps_v = np.nan
-
-            if ps_idx is not None:
-                t_p = x[ps_idx]
-                v_p = y[ps_idx]
-
-                # ---- 3. Find post-PS baseline anchor ----
-                after = slice(ps_idx + 1, i1)
-                if after.start < after.stop:
-                    b_rel = np.argmin(y[after])
-
-                    b_idx = after.start + b_rel
-                    t_b = x[b_idx]
-                    v_b = y[b_idx]
-
-                    # ---- 4. Baseline line ----
-                    m = (v_b - v_s) / (t_b - t_s)
-                    c = v_s - m * t_s
-                    v_base = m * t_p + c
-
-                    ps_amp = abs(v_p - v_base)
-                    ps_s, ps_v = t_p, v_p
-
-            results.append({
-                "stim_intensity": stim,
-                "ps_amp": ps_amp,
-                "ps_s": ps_s,
-                "ps_v": ps_v,
-            })
-
-        return pd.DataFrame(results)
-
+        self,
+        abf_df: pd.DataFrame,
+        epsp_df: pd.DataFrame,
+        fs: float | None = None,
+    ) -> pd.DataFrame:
+        try:
+            stims, x, traces = stack_traces(abf_df)
+        except ValueError:
+            pass  # ragged traces: smooth and search each stim on its own
+        else:
+            # Equal-length traces are filtered in one call over the stack.
+            traces = self.apply_smoothing(traces, fs=fs, axis=1)
+            return self.calculate_traces(stims, x, traces, epsp_df)
+
+        stims, bounds, time, mean = split_traces(abf_df)
+        epsp_anchors = self._epsp_anchors(epsp_df)
+        out = np.full((3, stims.size), np.nan)  # ps_amp, ps_s, ps_v
+        for k, (stim, s, e) in enumerate(zip(stims, bounds[:-1], bounds[1:])):
+            x = time[s:e]
+            y = _as_traces(self.apply_smoothing(mean[s:e], fs=fs))
+            t_s, v_s = epsp_anchors[stim]
+            i0, i1 = (int(i) for i in np.searchsorted(x, (t_s, t_s + self.ps_lag / 1000.0)))
+            ps_idx = _ps_peak(y, i0, i1, float(self.prominence))
+            out[:, k] = self._measure(x, y, t_s, v_s, ps_idx, i1)
+        return self._frame(stims, out)
+
+    def calculate_traces(
+        self,
+        stims: np.ndarray,
+        x: np.ndarray,
+        traces: np.ndarray,
+        epsp_df: pd.DataFrame,
+    ) -> pd.DataFrame:
+        """Population spike on smoothed traces laid out as (n_stims, n_time)."""
+        epsp_anchors = self._epsp_anchors(epsp_df)
+        anchors = [epsp_anchors[stim] for stim in stims]
+        t_s = np.array([a[0] for a in anchors], dtype=np.float64)
+        # Every row shares x, so all search windows resolve in one call.
+        i0, i1 = np.searchsorted(x, np.stack([t_s, t_s + self.ps_lag / 1000.0]))
+        # Rows are independent, so the peak search runs in parallel outside the GIL.
+        traces = _as_traces(traces)
+        ps_idx = np.empty(stims.size, dtype=np.int64)
+        _ps_kernel(traces, i0, i1, float(self.prominence), ps_idx)
+
+        out = np.full((3, stims.size), np.nan)  # ps_amp, ps_s, ps_v
+        for k in np.flatnonzero(ps_idx >= 0):
+            t, v = anchors[k]
+            out[:, k] = self._measure(x, traces[k], t, v, int(ps_idx[k]), int(i1[k]))
+        return self._frame(stims, out)
+
+    @staticmethod
+    def _epsp_anchors(epsp_df: pd.DataFrame) -> dict:
+        """EPSP minimum (epsp_s, epsp_v) per stim, from its first EPSP row."""
+        anchors: dict = {}
+        for stim, t_s, v_s in zip(
+            epsp_df["stim_intensity"].to_numpy(),
+            epsp_df["epsp_s"].to_numpy(),
+            epsp_df["epsp_v"].to_numpy(),
+        ):
+            anchors.setdefault(stim, (t_s, v_s))
+        return anchors
+
+    @staticmethod
+    def _frame(stims: np.ndarray, out: np.ndarray) -> pd.DataFrame:
+        """Result table from stacked per-stim (ps_amp, ps_s, ps_v) rows."""
+        return pd.DataFrame({
+            "stim_intensity": stims,
+            "ps_amp": out[0],
+            "ps_s": out[1],
+            "ps_v": out[2],
+        }, copy=False)
+
+    @staticmethod
+    def _measure(
+        x: np.ndarray,
+        y: np.ndarray,
+        t_s: float,
+        v_s: float,
+        ps_idx: int,
+        i1: int,
+    ) -> tuple[float, float, float]:
+        """
+        (ps_amp, ps_s, ps_v) for one smoothed trace ``y`` sampled at times ``x``.
+
+        The search window ends at ``i1`` and starts at the EPSP minimum
+        (t_s, v_s); ``ps_idx`` is its most prominent peak (see ``_ps_peak``),
+        or -1 when none qualifies.
+        """
+        ps_amp = ps_s = ps_v = np.nan
+
+        if ps_idx >= 0:
+            t_p = x[ps_idx]
+            v_p = y[ps_idx]
+
+            # ---- 3. Find post-PS baseline anchor ----
+            after = slice(ps_idx + 1, i1)
+            if after.start < after.stop:
+                b_rel = np.argmin(y[after])
+
+                b_idx = after.start + b_rel
+                t_b = x[b_idx]
+                v_b = y[b_idx]
+
+                # ---- 4. Baseline line ----
+                m = (v_b - v_s) / (t_b - t_s)
+                c = v_s - m * t_s
+                v_base = m * t_p + c
+
+                ps_amp = abs(v_p - v_base)
+                ps_s, ps_v = t_p, v_p
+
+        return ps_amp, ps_s, ps_v
@@ -1,19 +1,97 @@
+import json
 import pyabf
+import numpy as np
 import pandas as pd
 from dataclasses import asdict, is_dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Sequence
 from epspkit.core.context import RecordingContext
 
 # Add other load_*_to_context functions as needed for other filetypes
 
+@lru_cache(maxsize=8)
+def _read_abf_arrays(
+    file_path: str,
+    mtime_ns: int,
+    stim_intensities: tuple[float, ...],
+    repnum: int,
+) -> tuple[dict[str, np.ndarray], float]:
+    """
+    Parse an ABF file into read-only tidy columns plus its sampling rate.
+
+    Cached per (path, mtime, stim_intensities, repnum) so reloading an
+    unchanged file skips pyABF entirely; ``mtime_ns`` is part of the key only
+    to invalidate the entry when the file changes on disk.
+    """
+    abf = pyabf.ABF(file_path)
+
+    n_intensities = len(stim_intensities)
+    n_sweeps = len(abf.sweepList)
+    expected = n_intensities * repnum
+    if n_sweeps != expected:
+        raise ValueError(
+            f"{file_path}: expected {expected} sweeps for "
+            f"{n_intensities} intensities and repnum={repnum}, got {n_sweeps}"
+        )
+
+    # Episodic sweeps share one length, so every column is allocated once and
+    # filled in place instead of concatenating per-sweep pieces. sweepX is
+    # sweep-relative and identical for every sweep, so it is read once.
+    n_samples = abf.sweepPointCount
+    time_axis = np.array(abf.sweepX, dtype=np.float64)              # seconds
+    voltage = np.empty((n_sweeps, n_samples), dtype=abf.sweepY.dtype)
+    for sweep_i, sweepNumber in enumerate(abf.sweepList):
+        abf.setSweep(sweepNumber)
+        voltage[sweep_i] = abf.sweepY                                # mV
+
+    # Label columns are narrowed to int32 (integral intensities included) to
+    # cut memory traffic; fractional intensities stay float64 so values such
+    # as 0.1 round-trip exactly. Time stays float64 so sweep grids compare
+    # exactly, and voltage keeps pyABF's float32.
+    sweep_i = np.arange(n_sweeps, dtype=np.int32)
+    intensity_index = sweep_i // repnum
+    sweep_in_rep = (sweep_i % repnum) + 1  # 1..repnum, resets each intensity
+    intensities = np.asarray(stim_intensities)
+    if intensities.dtype.kind in "iu":
+        intensities = intensities.astype(np.int32)
+
+    columns = {
+        "time": np.tile(time_axis, n_sweeps),
+        "voltage": voltage.ravel(),
+        "stim_intensity": np.repeat(intensities[intensity_index], n_samples),  # µA
+        "abf_sweep": np.repeat(np.asarray(abf.sweepList, dtype=np.int32), n_samples),  # original ABF sweep id/index
+        "sweepNumber": np.repeat(sweep_in_rep, n_samples),           # 1..repnum within each intensity
+    }
+    for arr in columns.values():
+        arr.flags.writeable = False
+
+    return columns, abf.sampleRate  # sampling frequency in Hz
+
+
+def clear_abf_cache() -> None:
+    """
+    Drop the parsed ABF data kept by ``load_abf_to_context``.
+
+    Up to eight recordings stay cached so re-running a pipeline on the same
+    files skips parsing; batch jobs that read each file once can call this
+    afterwards to release that memory.
+    """
+    _read_abf_arrays.cache_clear()
+
+
 def load_abf_to_context(
     file_path: str,
     stim_intensities: list[float],
-    repnum: int
+    repnum: int,
+    dtype: np.dtype | None = None,
 ) -> RecordingContext:
     """
     Load an ABF file and convert it to a RecordingContext.
 
+    Parsed ABF data is cached per file and invalidated when the file's
+    modification time changes, so repeated loads only rebuild the DataFrame.
+
     Parameters
     ----------
     file_path
@@ -22,50 +100,128 @@ def load_abf_to_context(
         List of stimulus intensities.
     repnum
         Repetition number.
+    dtype
+        Floating dtype for voltage data (e.g. ``np.float32``); recorded on
+        the context so averaging keeps it. None keeps pyABF's dtype.
     Returns
     -------
     RecordingContext
         RecordingContext object containing the data from the ABF file.
     """
-    abf = pyabf.ABF(file_path)
+    path = Path(file_path)
+    columns, fs = _read_abf_arrays(
+        str(path),
+        path.stat().st_mtime_ns,
+        tuple(stim_intensities),
+        int(repnum),
+    )
 
-    n_intensities = len(stim_intensities)
-    n_sweeps = len(abf.sweepList)
-    expected = n_intensities * repnum
-    if n_sweeps != expected:
-        raise ValueError(
-            f"{file_path}: expected {expected} sweeps for "
-            f"{n_intensities} intensities and repnum={repnum}, got {n_sweeps}"
-        )
+    # Copy out of the cache so transforms never touch the shared arrays.
+    tidy_df = pd.DataFrame(columns, copy=True)
+    # Few distinct intensities: integer category codes make every downstream
+    # per-stim groupby cheaper than hashing the raw values. Categories are the
+    # ascending intensities and ordered, so sorts and comparisons on the codes
+    # agree with the numeric values.
+    tidy_df["stim_intensity"] = pd.Categorical(tidy_df["stim_intensity"], ordered=True)
+    if dtype is not None:
+        tidy_df["voltage"] = tidy_df["voltage"].astype(dtype, copy=False)
 
-    data = []
-    for sweep_i, sweepNumber in enumerate(abf.sweepList):
-        abf.setSweep(sweepNumber)
+    context = RecordingContext(
+        tidy=tidy_df,
+        averaged=pd.DataFrame(),
+        fs=fs,
+        dtype=dtype,
+    )
+
+    return context
+
+# ASCII characters Excel sheet names keep as-is; everything else becomes "_".
+_SHEET_NAME_TABLE = str.maketrans({
+    c: "_" for c in map(chr, range(128)) if not (c.isalnum() or c in "_-")
+})
+
+
+def _normalize(value):
+    """Convert dataclasses, Paths and containers to plain serializable values."""
+    if isinstance(value, Path):
+        return str(value)
+    if is_dataclass(value):
+        return _normalize(asdict(value))
+    if isinstance(value, dict):
+        return {k: _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def _safe_sheet_name(name: str, used: set[str]) -> str:
+    if name.isascii():
+        cleaned = name.translate(_SHEET_NAME_TABLE)
+    else:
+        cleaned = "".join(c if c.isalnum() or c in ("_", "-") else "_" for c in name)
+    cleaned = cleaned[:31] if cleaned else "sheet"
+    sheet = cleaned
+    i = 1
+    while sheet in used:
+        suffix = f"_{i}"
+        sheet = f"{cleaned[:31 - len(suffix)]}{suffix}"
+        i += 1
+    used.add(sheet)
+    return sheet
 
-        intensity_index = sweep_i // repnum
-        stim_intensity = stim_intensities[intensity_index]
 
-        sweep_in_rep = (sweep_i % repnum) + 1  # 1..repnum, resets each intensity
+def _write_context_sheets(
+    writer: pd.ExcelWriter,
+    context: RecordingContext,
+    used_sheets: set[str],
+    prefix: str = "",
+) -> None:
+    """Write one context's tables to an open workbook, sheet names prefixed."""
+    def sheet(name: str) -> str:
+        return _safe_sheet_name(f"{prefix}{name}", used_sheets)
 
-        data.append(
-            pd.DataFrame({
-                "time": abf.sweepX,                 # seconds
-                "voltage": abf.sweepY,              # mV
-                "stim_intensity": stim_intensity,   # µA
-                "abf_sweep": sweepNumber,           # original ABF sweep id/index
-                "sweepNumber": sweep_in_rep,        # 1..repnum within each intensity
-            })
+    if context.tidy is not None and not context.tidy.empty:
+        context.tidy.to_excel(
+            writer,
+            sheet_name=sheet("tidy"),
+            index=False,
+        )
+    if context.averaged is not None and not context.averaged.empty:
+        context.averaged.to_excel(
+            writer,
+            sheet_name=sheet("averaged"),
+            index=False,
         )
 
-    tidy_df = pd.concat(data, ignore_index=True)
+    results = context.results or {}
+    for name, df in results.items():
+        if isinstance(df, pd.DataFrame) and not df.empty:
+            df.to_excel(writer, sheet_name=sheet(f"result_{name}"), index=False)
 
-    context = RecordingContext(
-        tidy=tidy_df,
-        averaged=pd.DataFrame(),
-        fs=abf.sampleRate,  # sampling frequency in Hz
-    )
+    meta = _normalize(context.metadata)
+    if meta:
+        meta_df = pd.json_normalize(meta, sep=".")
+        meta_df.to_excel(
+            writer,
+            sheet_name=sheet("metadata"),
+            index=False,
+        )
+
+
+def _write_config_sheet(
+    writer: pd.ExcelWriter,
+    context: RecordingContext,
+    used_sheets: set[str],
+) -> None:
+    cfg = _normalize(context.pipeline_cfg) if context.pipeline_cfg is not None else None
+    if cfg:
+        cfg_df = pd.json_normalize(cfg, sep=".")
+        cfg_df.to_excel(
+            writer,
+            sheet_name=_safe_sheet_name("pipeline_config", used_sheets),
+            index=False,
+        )
 
-    return context
 
 def save_context_to_xlsx(
     context: RecordingContext,
@@ -84,71 +240,128 @@ def save_context_to_xlsx(
     output_stem
         Stem used when file_path is a directory.
     """
-    def normalize(value):
-        if isinstance(value, Path):
-            return str(value)
-        if is_dataclass(value):
-            return normalize(asdict(value))
-        if isinstance(value, dict):
-            return {k: normalize(v) for k, v in value.items()}
-        if isinstance(value, (list, tuple)):
-            return [normalize(v) for v in value]
-        return value
-
-    def safe_sheet_name(name: str, used: set[str]) -> str:
-        cleaned = "".join(c if c.isalnum() or c in ("_", "-") else "_" for c in name)
-        cleaned = cleaned[:31] if cleaned else "sheet"
-        sheet = cleaned
-        i = 1
-        while sheet in used:
-            suffix = f"_{i}"
-            sheet = f"{cleaned[:31 - len(suffix)]}{suffix}"
-            i += 1
-        used.add(sheet)
-        return sheet
-
     output = Path(file_path)
     if output.suffix:
         output = output.with_suffix(".xlsx")
     else:
         stem = output_stem or "recording"
         output = output / f"{stem}_results.xlsx"
+
+    used_sheets: set[str] = set()
+
+    with pd.ExcelWriter(output) as writer:
+        _write_context_sheets(writer, context, used_sheets)
+        _write_config_sheet(writer, context, used_sheets)
+
+
+def save_contexts_to_xlsx(
+    contexts: Sequence[RecordingContext],
+    file_path: str,
+    output_stems: Sequence[str],
+) -> None:
+    """
+    Save several RecordingContexts to one shared Excel workbook.
+
+    Each recording's sheets get a short prefix by position (``r1_tidy``,
+    ``r2_result_epsp``, ...), so names stay within Excel's 31-character
+    limit however long the stems are; a leading ``recordings`` sheet maps
+    each prefix to its stem. The pipeline config is written once, from the
+    first context that has one.
+    The archive is opened and finalized once instead of once per file.
+
+    Parameters
+    ----------
+    contexts
+        RecordingContext objects to save.
+    file_path
+        Path to the output XLSX file, or a directory for ``results.xlsx``.
+    output_stems
+        One stem per context, listed in the ``recordings`` index sheet.
+    """
+    output = Path(file_path)
+    if output.suffix:
+        output = output.with_suffix(".xlsx")
+    else:
+        output = output / "results.xlsx"
     used_sheets: set[str] = set()
 
+    prefixes = [f"r{idx + 1}_" for idx in range(len(contexts))]
+    index = pd.DataFrame({
+        "sheet_prefix": prefixes,
+        "output_stem": list(output_stems)[:len(contexts)],
+    })
+
     with pd.ExcelWriter(output) as writer:
-        if context.tidy is not None and not context.tidy.empty:
-            context.tidy.to_excel(
-                writer,
-                sheet_name=safe_sheet_name("tidy", used_sheets),
-                index=False,
-            )
-        if context.averaged is not None and not context.averaged.empty:
-            context.averaged.to_excel(
-                writer,
-                sheet_name=safe_sheet_name("averaged", used_sheets),
-                index=False,
-            )
-
-        results = context.results or {}
+        index.to_excel(
+            writer,
+            sheet_name=_safe_sheet_name("recordings", used_sheets),
+            index=False,
+        )
+        for context, prefix in zip(contexts, prefixes):
+            _write_context_sheets(writer, context, used_sheets, prefix=prefix)
+        config_context = next(
+            (ctx for ctx in contexts if ctx.pipeline_cfg is not None), None
+        )
+        if config_context is not None:
+            _write_config_sheet(writer, config_context, used_sheets)
+
+
+def save_context_to_parquet(
+    context: RecordingContext,
+    file_path: str,
+    output_stem: str | None = None,
+) -> None:
+    """
+    Save RecordingContext contents to a directory of Parquet files.
+
+    Tables are written with pyarrow's columnar writer (snappy-compressed),
+    which is far faster than Excel for large ``tidy`` frames and keeps
+    dtypes intact. Requires the optional ``pyarrow`` dependency.
+
+    Layout: ``tidy.parquet``, ``averaged.parquet``, ``results/<name>.parquet``
+    plus ``metadata.json`` and ``pipeline_config.json``.
+
+    Parameters
+    ----------
+    context
+        RecordingContext object containing the results to save.
+    file_path
+        Output directory. A path with a suffix is replaced by a directory of
+        the same stem.
+    output_stem
+        Stem used when file_path is a parent directory.
+    """
+    output = Path(file_path)
+    if output.suffix:
+        output = output.with_suffix("")
+    else:
+        stem = output_stem or "recording"
+        output = output / f"{stem}_results"
+    output.mkdir(parents=True, exist_ok=True)
+
+    def write_table(df: pd.DataFrame, path: Path) -> None:
+        df.to_parquet(path, engine="pyarrow", compression="snappy", index=False)
+
+    if context.tidy is not None and not context.tidy.empty:
+        write_table(context.tidy, output / "tidy.parquet")
+    if context.averaged is not None and not context.averaged.empty:
+        write_table(context.averaged, output / "averaged.parquet")
+
+    results = {
+        name: df
+        for name, df in (context.results or {}).items()
+        if isinstance(df, pd.DataFrame) and not df.empty
+    }
+    if results:
+        results_dir = output / "results"
+        results_dir.mkdir(exist_ok=True)
         for name, df in results.items():
-            if isinstance(df, pd.DataFrame) and not df.empty:
-                sheet_name = safe_sheet_name(f"result_{name}", used_sheets)
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
-
-        meta = normalize(context.metadata)
-        if meta:
-            meta_df = pd.json_normalize(meta, sep=".")
-            meta_df.to_excel(
-                writer,
-                sheet_name=safe_sheet_name("metadata", used_sheets),
-                index=False,
-            )
-
-        cfg = normalize(context.pipeline_cfg) if context.pipeline_cfg is not None else None
-        if cfg:
-            cfg_df = pd.json_normalize(cfg, sep=".")
-            cfg_df.to_excel(
-                writer,
-                sheet_name=safe_sheet_name("pipeline_config", used_sheets),
-                index=False,
-            )
+            write_table(df, results_dir / f"{name}.parquet")
+
+    # Metadata and config are small nested mappings; JSON keeps them readable.
+    meta = _normalize(context.metadata)
+    if meta:
+        (output / "metadata.json").write_text(json.dumps(meta, indent=2, default=str))
+    cfg = _normalize(context.pipeline_cfg) if context.pipeline_cfg is not None else None
+    if cfg:
+        (output / "pipeline_config.json").write_text(json.dumps(cfg, indent=2, default=str))
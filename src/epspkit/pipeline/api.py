@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import os
 from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Any, Callable
 
+import numpy as np
+
 from epspkit.core.config import (
     FeatureConfig,
     PipelineConfig,
@@ -15,7 +20,12 @@ from epspkit.core.context import RecordingContext
 from epspkit.features.epsp import EPSPFeature
 from epspkit.features.fiber_volley import FiberVolleyFeature
 from epspkit.features.pop_spike import PopSpikeFeature
-from epspkit.io.read_write import load_abf_to_context, save_context_to_xlsx
+from epspkit.io.read_write import (
+    load_abf_to_context,
+    save_context_to_parquet,
+    save_context_to_xlsx,
+    save_contexts_to_xlsx,
+)
 from epspkit.transforms.average import average_sweeps
 from epspkit.transforms.baseline import baseline_correction
 from epspkit.transforms.stim_artifact import (
@@ -40,6 +50,16 @@ PLOT_CLASSES: dict[str, type] = {
     "input_output": IOPlot,
 }
 
+RESULT_WRITERS: dict[str, Callable[..., None]] = {
+    "xlsx": save_context_to_xlsx,
+    "parquet": save_context_to_parquet,
+}
+
+PRECISION_DTYPES: dict[str, type] = {
+    "fp32": np.float32,
+    "fp64": np.float64,
+}
+
 TRANSFORM_FUNCS: dict[str, Callable[..., RecordingContext]] = {
     "baseline_correction": baseline_correction,
     "crop_stim_artifact": crop_stim_artifact,
@@ -75,32 +95,24 @@ def build_feature(config: FeatureConfig, global_smoothing: SmoothingConfig):
 def build_plot(config: VizConfig, global_smoothing: SmoothingConfig):
     return _build_component(config, PLOT_CLASSES, "plot", global_smoothing)
 
+def _resolve_smoothing(
+    configs: Sequence[FeatureConfig | VizConfig],
+    global_cfg: SmoothingConfig,
+) -> None:
+    # SmoothingConfig is frozen, so every unset config can share the global
+    # instance instead of a fresh copy.
+    for cfg in configs:
+        if cfg.smoothing is None:
+            cfg.smoothing = global_cfg
+
+
 def resolve_plot_smoothing(pipeline_config: PipelineConfig) -> None:
-    if not pipeline_config.plots:
-        return
-    global_cfg = pipeline_config.global_smoothing
-    for plot_cfg in pipeline_config.plots:
-        if plot_cfg.smoothing is None:
-            plot_cfg.smoothing = SmoothingConfig(
-                method=global_cfg.method,
-                window_size=global_cfg.window_size,
-                polyorder=global_cfg.polyorder,
-                cutoff=global_cfg.cutoff,
-                order=global_cfg.order,
-            )
+    _resolve_smoothing(pipeline_config.plots or (), pipeline_config.global_smoothing)
+
+
 def resolve_feature_smoothing(pipeline_config: PipelineConfig) -> None:
-    if not pipeline_config.features:
-        return
-    global_cfg = pipeline_config.global_smoothing
-    for feature_cfg in pipeline_config.features:
-        if feature_cfg.smoothing is None:
-            feature_cfg.smoothing = SmoothingConfig(
-                method=global_cfg.method,
-                window_size=global_cfg.window_size,
-                polyorder=global_cfg.polyorder,
-                cutoff=global_cfg.cutoff,
-                order=global_cfg.order,
-            )
+    _resolve_smoothing(pipeline_config.features or (), pipeline_config.global_smoothing)
+
 
 def build_transform(
     config: TransformConfig,
@@ -116,6 +128,15 @@ def run_context(
     context: RecordingContext,
     pipeline_config: PipelineConfig,
     output_stem: str | None = None,
+) -> RecordingContext:
+    context = _analyze_context(context, pipeline_config)
+    _draw_plots(context, pipeline_config, output_stem=output_stem)
+    return context
+
+
+def _analyze_context(
+    context: RecordingContext,
+    pipeline_config: PipelineConfig,
 ) -> RecordingContext:
     if pipeline_config.io.write_plots and not pipeline_config.io.output_path:
         raise ValueError(
@@ -134,13 +155,21 @@ def run_context(
         if isinstance(result, RecordingContext):
             context = result
 
-    if context.averaged is None or context.averaged.empty:
+    if not context.averaged_is_current:
         average_sweeps(context)
 
     for feature_cfg in pipeline_config.features:
         feature = build_feature(feature_cfg, pipeline_config.global_smoothing)
         context = feature.run(context)
 
+    return context
+
+
+def _draw_plots(
+    context: RecordingContext,
+    pipeline_config: PipelineConfig,
+    output_stem: str | None = None,
+) -> None:
     plots = pipeline_config.plots
     if plots and (pipeline_config.io.render_plots or pipeline_config.io.write_plots):
         for plot_cfg in plots:
@@ -150,7 +179,34 @@ def run_context(
             if pipeline_config.io.write_plots:
                 plot.save(context, pipeline_config.io.output_path, output_stem=output_stem)
 
-    return context
+
+def _load_and_run(
+    path: str,
+    pipeline_config: PipelineConfig,
+    output_stem: str | None,
+    draw_plots: bool = True,
+) -> RecordingContext:
+    precision = pipeline_config.io.precision
+    dtype = PRECISION_DTYPES.get(precision)
+    if dtype is None:
+        options = ", ".join(sorted(PRECISION_DTYPES))
+        raise ValueError(f"Unknown precision '{precision}'. Available: {options}")
+    context = load_abf_to_context(
+        file_path=path,
+        stim_intensities=list(pipeline_config.io.stim_intensities),
+        repnum=pipeline_config.io.repnum,
+        dtype=dtype,
+    )
+    context.metadata.update(pipeline_config.io.metadata or {})
+    if not draw_plots:
+        return _analyze_context(context, pipeline_config)
+    return run_context(context, pipeline_config, output_stem=output_stem)
+
+
+def _worker_count(requested: int | None, n_paths: int) -> int:
+    if requested is None or requested < 0:
+        requested = os.cpu_count() or 1
+    return max(min(requested, n_paths), 1)
 
 
 def run_pipeline(
@@ -173,19 +229,53 @@ def run_pipeline(
         return [Path(path).stem for path in input_paths]
 
     output_stems = build_output_stems(pipeline_config.io.input_paths)
-    contexts = []
-    for idx, path in enumerate(pipeline_config.io.input_paths):
-        context = load_abf_to_context(
-            file_path=path,
-            stim_intensities=list(pipeline_config.io.stim_intensities),
-            repnum=pipeline_config.io.repnum,
-        )
-        context.metadata.update(pipeline_config.io.metadata or {})
-        output_stem = output_stems[idx] if idx < len(output_stems) else None
-        contexts.append(run_context(context, pipeline_config, output_stem=output_stem))
+    paths = list(pipeline_config.io.input_paths)
+    n_jobs = _worker_count(pipeline_config.io.n_jobs, len(paths))
+    n_workers = _worker_count(pipeline_config.io.n_workers, len(paths))
+
+    if n_jobs > 1 and not pipeline_config.io.render_plots:
+        # Files are independent, so each one is loaded and analyzed in its
+        # own process; results come back in input order. Workers get a copy
+        # of the config, so resolve it here for the caller's copy as well.
+        resolve_plot_smoothing(pipeline_config)
+        resolve_feature_smoothing(pipeline_config)
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            contexts = list(pool.map(
+                _load_and_run,
+                paths,
+                [pipeline_config] * len(paths),
+                output_stems,
+            ))
+    elif n_workers > 1:
+        # Threads overlap ABF reads with the transforms and feature kernels,
+        # which release the GIL; parallel kernel launches are serialized in
+        # core._kernels. pyplot and rcParams are process-global, so plots
+        # are drawn afterwards on this thread, in input order.
+        resolve_plot_smoothing(pipeline_config)
+        resolve_feature_smoothing(pipeline_config)
+        with ThreadPoolExecutor(max_workers=n_workers) as pool:
+            contexts = list(pool.map(
+                partial(_load_and_run, draw_plots=False),
+                paths,
+                [pipeline_config] * len(paths),
+                output_stems,
+            ))
+        for context, output_stem in zip(contexts, output_stems):
+            _draw_plots(context, pipeline_config, output_stem=output_stem)
+    else:
+        contexts = [
+            _load_and_run(path, pipeline_config, output_stem)
+            for path, output_stem in zip(paths, output_stems)
+        ]
 
     if pipeline_config.io.write_results and pipeline_config.io.output_path:
-        write_results(contexts, pipeline_config.io.output_path, output_stems)
+        write_results(
+            contexts,
+            pipeline_config.io.output_path,
+            output_stems,
+            output_format=pipeline_config.io.output_format,
+            n_jobs=n_jobs,
+        )
 
     return contexts
 
@@ -194,18 +284,44 @@ def write_results(
     contexts: Sequence[RecordingContext],
     output_path: Path | str,
     output_stems: Sequence[str] | None = None,
+    output_format: str = "xlsx",
+    n_jobs: int = 1,
 ) -> None:
+    writer = RESULT_WRITERS.get(output_format)
+    if writer is None and output_format != "xlsx_single":
+        options = ", ".join(sorted([*RESULT_WRITERS, "xlsx_single"]))
+        raise ValueError(f"Unknown output format '{output_format}'. Available: {options}")
+
     output = Path(output_path)
     stems = list(output_stems or [])
     if not stems:
         stems = [f"recording_{idx + 1}" for idx in range(len(contexts))]
 
+    if writer is None:
+        # One shared workbook, one set of stem-prefixed sheets per recording.
+        if not output.suffix:
+            output.mkdir(parents=True, exist_ok=True)
+        stems += [f"recording_{idx + 1}" for idx in range(len(stems), len(contexts))]
+        save_contexts_to_xlsx(contexts, str(output), stems)
+        return
+
     if output.suffix and len(contexts) == 1:
-        save_context_to_xlsx(contexts[0], str(output), output_stem=stems[0])
+        writer(contexts[0], str(output), output_stem=stems[0])
         return
 
     output_dir = output if not output.suffix else output.parent
     output_dir.mkdir(parents=True, exist_ok=True)
-    for idx, context in enumerate(contexts):
-        stem = stems[idx] if idx < len(stems) else f"recording_{idx + 1}"
-        save_context_to_xlsx(context, str(output_dir), output_stem=stem)
+    stems = [
+        stems[idx] if idx < len(stems) else f"recording_{idx + 1}"
+        for idx in range(len(contexts))
+    ]
+    n_jobs = min(n_jobs, len(contexts))
+    if n_jobs > 1:
+        # Workbook serialization (XML + zlib) is CPU-bound and holds the
+        # GIL, so independent recordings are written in separate processes.
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            list(pool.map(writer, contexts, [str(output_dir)] * len(contexts), stems))
+        return
+    for context, stem in zip(contexts, stems):
+        writer(context, str(output_dir), output_stem=stem)
+
@@ -9,7 +9,7 @@ from epspkit.core.context import RecordingContext
 def average_sweeps(context: RecordingContext) -> RecordingContext:
     tidy = context.tidy
     if tidy is None or tidy.empty:
-        context.averaged = tidy.copy()
+        context.set_averaged(tidy.copy())
         return context
 
     group_cols = ["stim_intensity", "time"]
@@ -19,7 +19,7 @@ def average_sweeps(context: RecordingContext) -> RecordingContext:
         raise ValueError(f"Missing required columns for averaging: {missing_str}")
 
     if "mean" in tidy.columns:
-        context.averaged = (
+        context.set_averaged(
             tidy.sort_values(group_cols, kind="mergesort")
             .reset_index(drop=True)
         )
@@ -28,16 +28,18 @@ def average_sweeps(context: RecordingContext) -> RecordingContext:
     if "voltage" not in tidy.columns:
         raise ValueError("Expected 'voltage' column in tidy data.")
 
-    averaged = (
-        tidy.groupby(group_cols, sort=False)
-        .agg(
-            mean=("voltage", "mean"),
-            sem=("voltage", lambda x: x.std(ddof=1) / np.sqrt(len(x))),
-        )
-        .reset_index()
-        .sort_values(group_cols, kind="mergesort")
-        .reset_index(drop=True)
+    # Built-in reductions only (no per-group Python callback); SEM is then
+    # one vector division. Sorting the group keys yields the
+    # (stim_intensity, time) order directly.
+    stats = (
+        tidy.groupby(group_cols, sort=True, observed=True)["voltage"]
+        .agg(["mean", "std", "size"])
     )
+    stats["sem"] = stats["std"].to_numpy(dtype=np.float64) / np.sqrt(stats["size"].to_numpy())
+    averaged = stats[["mean", "sem"]].reset_index()
+
+    if context.dtype is not None:
+        averaged = averaged.astype({"mean": context.dtype, "sem": context.dtype})
 
-    context.averaged = averaged
+    context.set_averaged(averaged)
     return context
@@ -6,7 +6,8 @@ from epspkit.core.context import RecordingContext
 
 def baseline_correction(
     context: RecordingContext,
-    baseline_window_ms: tuple[float, float] = (0.0, 0.1)
+    baseline_window_ms: tuple[float, float] = (0.0, 0.1),
+    baseline_stride: int = 1,
 ) -> pd.DataFrame:
     """
     Apply baseline correction to tidy DataFrame.
@@ -17,29 +18,53 @@ def baseline_correction(
         RecordingContext object containing the tidy DataFrame.
     baseline_window_ms
         Time window (start_ms, end_ms) in milliseconds to use for baseline calculation.
+    baseline_stride
+        Average every baseline_stride-th sample of the window. The baseline is
+        a slow quantity, so a stride > 1 gives nearly the same mean from
+        fewer samples on long, high-rate windows. 1 uses every sample.
 
     Returns
     -------
     pd.DataFrame
         Tidy DataFrame with baseline-corrected voltage values.
     """
+    if baseline_stride < 1:
+        raise ValueError(f"baseline_stride must be >= 1 (got {baseline_stride}).")
     tidy_df = context.tidy
     t_start, t_end = [v / 1000.0 for v in baseline_window_ms]
 
-    def correct_group(g: pd.DataFrame) -> pd.DataFrame:
-        g = g.sort_values("time")
-        x = g["time"].to_numpy()
-        y = g["voltage"].to_numpy()
+    key_cols = ["stim_intensity", "abf_sweep"]
+    df = tidy_df[key_cols + ["sweepNumber", "time", "voltage"]].sort_values(
+        key_cols + ["time"], kind="mergesort"
+    )
+    time = df["time"].to_numpy()
+    voltage = df["voltage"].to_numpy()
 
-        # time-based indices (robust to tiny dt rounding)
-        start_idx = int(np.searchsorted(x, t_start))
-        stop_idx = int(np.searchsorted(x, t_end))
+    # Sweeps are contiguous after the sort; label each row with its sweep.
+    stim = df["stim_intensity"].to_numpy()
+    sweep = df["abf_sweep"].to_numpy()
+    new_run = np.ones(time.size, dtype=bool)
+    new_run[1:] = (stim[1:] != stim[:-1]) | (sweep[1:] != sweep[:-1])
+    run_id = np.cumsum(new_run) - 1
+    n_runs = int(run_id[-1]) + 1 if run_id.size else 0
 
-        baseline = np.mean(y[start_idx:stop_idx])
-        g["voltage"] = g["voltage"] - baseline
-        return g
+    # Per-sweep mean over the window in one pass: the samples searchsorted
+    # would select, i.e. t_start <= time < t_end. Empty windows give NaN.
+    in_window = np.flatnonzero((time >= t_start) & (time < t_end))
+    if baseline_stride > 1:
+        # Keep every stride-th window sample of each sweep, counted from the
+        # sweep's first sample in the window.
+        run_w = run_id[in_window]
+        first = np.ones(run_w.size, dtype=bool)
+        first[1:] = run_w[1:] != run_w[:-1]
+        pos = np.arange(run_w.size)
+        rank = pos - np.maximum.accumulate(np.where(first, pos, 0))
+        in_window = in_window[rank % baseline_stride == 0]
+    sums = np.bincount(run_id[in_window], weights=voltage[in_window], minlength=n_runs)
+    counts = np.bincount(run_id[in_window], minlength=n_runs)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        baseline = sums / counts
 
-    context.tidy = tidy_df.groupby(["stim_intensity", "abf_sweep"], group_keys=False)[
-            ["stim_intensity", "abf_sweep", "sweepNumber", "time", "voltage"]
-        ].apply(correct_group)
-    return context
\ No newline at end of file
+    df["voltage"] = (voltage - baseline[run_id]).astype(voltage.dtype, copy=False)
+    context.set_tidy(df)
+    return context
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import numpy as np
 import pandas as pd
+from epspkit.core._kernels import NUMBA_AVAILABLE, _template_subtract
 from epspkit.core.context import RecordingContext
 
 def crop_stim_artifact(
@@ -26,21 +27,31 @@ def crop_stim_artifact(
     tidy_df = context.tidy
     t0, t1 = [v / 1000.0 for v in window_ms]
 
-    def crop_group(g: pd.DataFrame) -> pd.DataFrame:
-        g = g.sort_values("time")
-        x = g["time"].to_numpy()
-
-        # time-based indices (robust to tiny dt rounding)
-        start_idx = int(np.searchsorted(x, t0))
-        stop_idx = int(np.searchsorted(x, t1))
-
-        cropped = pd.concat([g.iloc[:start_idx], g.iloc[stop_idx:]], ignore_index=True)
-
-        # re-zero time so all traces align perfectly
-        cropped["time"] = cropped["time"] - float(cropped["time"].iloc[0])
-        return cropped
-
-    context.tidy = tidy_df.groupby(["stim_intensity", "abf_sweep"], group_keys=False)[["stim_intensity", "abf_sweep", "time", "voltage"]].apply(crop_group)
+    key_cols = ["stim_intensity", "abf_sweep"]
+    df = tidy_df[key_cols + ["time", "voltage"]].sort_values(
+        key_cols + ["time"], kind="mergesort"
+    )
+    time = df["time"].to_numpy()
+
+    # The window is in sweep-relative time, identical for every sweep, so one
+    # mask crops them all: the same rows searchsorted would slice out.
+    keep = (time < t0) | (time >= t1)
+    # One positional take is the only copy; the index is then replaced in
+    # place rather than through reset_index, which would copy again.
+    cropped = df.take(np.flatnonzero(keep))
+    cropped.index = pd.RangeIndex(len(cropped))
+
+    # re-zero time so all traces align perfectly: subtract each sweep's first
+    # remaining sample, found from where the (stim, sweep) key changes.
+    stim = cropped["stim_intensity"].to_numpy()
+    sweep = cropped["abf_sweep"].to_numpy()
+    kept_time = time[keep]
+    new_run = np.ones(kept_time.size, dtype=bool)
+    new_run[1:] = (stim[1:] != stim[:-1]) | (sweep[1:] != sweep[:-1])
+    run_start = np.maximum.accumulate(np.where(new_run, np.arange(kept_time.size), 0))
+    cropped["time"] = kept_time - kept_time[run_start]
+
+    context.set_tidy(cropped)
     return context
 
 def template_subtract_stim_artifact(
@@ -65,47 +76,62 @@ def template_subtract_stim_artifact(
     tidy_df = context.tidy
     t0, t1 = [v / 1000.0 for v in window_ms]
 
-    def subtract_template(g_int: pd.DataFrame) -> pd.DataFrame:
-        # g_int = all sweeps for one stim_intensity
-        g_int = g_int.sort_values(["abf_sweep", "time"]).copy()
-
-        # Build template using columns only
-        template_df = (
-            g_int
-            .groupby("time", sort=True)["voltage"]
-            .mean()
-            .reset_index()
-        )
-
-        t = template_df["time"].to_numpy()
-        T = template_df["voltage"].to_numpy()
-
-        start_idx = np.searchsorted(t, t0)
-        stop_idx  = np.searchsorted(t, t1)
-
-        denom = np.dot(T[start_idx:stop_idx], T[start_idx:stop_idx])
+    # Order rows by (stim_intensity, abf_sweep, time) once, gathering each
+    # output column with a single take. The gathered voltage is a fresh
+    # array, so the subtraction below works on it in place and the result
+    # frame wraps it without another copy.
+    stim_col = tidy_df["stim_intensity"]
+    if isinstance(stim_col.dtype, pd.CategoricalDtype):
+        stim_key = stim_col.cat.codes.to_numpy()  # sorts like sort_values
+    else:
+        stim_key = stim_col.to_numpy()
+    order = np.lexsort((
+        tidy_df["time"].to_numpy(),
+        tidy_df["abf_sweep"].to_numpy(),
+        stim_key,
+    ))
+    columns = {
+        col: tidy_df[col].array.take(order)
+        for col in ["stim_intensity", "abf_sweep", "sweepNumber", "time"]
+    }
+    stim = stim_key[order]
+    sweep = np.asarray(columns["abf_sweep"])
+    time = np.asarray(columns["time"])
+    voltage = tidy_df["voltage"].to_numpy()[order]
+
+    _, starts = np.unique(stim, return_index=True)
+    bounds = np.r_[starts, stim.size]
+    for s, e in zip(bounds[:-1], bounds[1:]):
+        # all sweeps for one stim_intensity, as (n_sweeps, n_time) views
+        n_sweeps = np.count_nonzero(np.diff(sweep[s:e])) + 1
+        n_time = (e - s) // n_sweeps
+        if n_sweeps * n_time != e - s:
+            raise ValueError("Time grid mismatch between sweep and template")
+        times = time[s:e].reshape(n_sweeps, n_time)
+        t = times[0]
+        # Sweeps share the loader's time axis; equal lengths plus matching
+        # endpoints (O(n_sweeps), not a full comparison) catch a shifted grid.
+        if not ((times[:, 0] == t[0]).all() and (times[:, -1] == t[-1]).all()):
+            raise ValueError("Time grid mismatch between sweep and template")
+
+        Y = voltage[s:e].reshape(n_sweeps, n_time)
+        T = Y.mean(axis=0, dtype=np.float64).astype(Y.dtype, copy=False)
+
+        start_idx, stop_idx = (int(i) for i in np.searchsorted(t, (t0, t1)))
+        T_w = T[start_idx:stop_idx]
+        denom = np.dot(T_w, T_w)
         if denom <= 1e-20:
-            return g_int
-
-        out = []
-        for sw, g in g_int.groupby("abf_sweep", sort=False):
-            g = g.sort_values("time").copy()
-            x = g["time"].to_numpy()
-            y = g["voltage"].to_numpy()
-
-            # sanity: time grids must match
-            # (can be removed once you're confident)
-            if not np.allclose(x, t):
-                raise ValueError("Time grid mismatch between sweep and template")
-
-            num = np.dot(y[start_idx:stop_idx], T[start_idx:stop_idx])
-            a = num / denom
-
-            y[start_idx:stop_idx] -= a * T[start_idx:stop_idx]
-            g["voltage"] = y
-            out.append(g)
-
-        return pd.concat(out, ignore_index=True)
-
-    context.tidy = tidy_df.groupby("stim_intensity", group_keys=False)[["stim_intensity", "abf_sweep", "sweepNumber", "time", "voltage"]].apply(subtract_template)
-    return context
\ No newline at end of file
+            continue
+
+        if NUMBA_AVAILABLE:
+            # Fused dot/scale/subtract per sweep, in place and in parallel.
+            _template_subtract(Y, T, start_idx, stop_idx, float(denom))
+        else:
+            # Least-squares scale of the template for every sweep in one
+            # matrix-vector product, then one broadcast subtraction.
+            a = (Y[:, start_idx:stop_idx] @ T_w) / denom
+            Y[:, start_idx:stop_idx] -= np.outer(a, T_w)
+
+    columns["voltage"] = voltage
+    context.set_tidy(pd.DataFrame(columns, copy=False))
+    return context
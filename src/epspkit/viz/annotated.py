@@ -7,9 +7,10 @@ import pandas as pd
 from matplotlib.colors import to_rgba
 from matplotlib.ticker import FuncFormatter
 
+from epspkit.core import math as emath
 from epspkit.core.config import SmoothingConfig, VizConfig
 from epspkit.core.context import RecordingContext
-from epspkit.viz.base import Plot
+from epspkit.viz.base import _SAVE_DPI, Plot, _s_to_ms
 
 class AnnotatedPlot(Plot):
     """
@@ -20,10 +21,9 @@ class AnnotatedPlot(Plot):
         self.rc_params = config.rc_params or {}
         self.style = config.style
         self.color_map = config.color_map
+        self._cmap = plt.get_cmap(self.color_map)
 
-    def _build_figure(self, context: RecordingContext) -> plt.Figure:
-        abf_df = context.averaged
-        fs = context.fs
+    def _build_figure(self, context: RecordingContext, fig: plt.Figure | None = None) -> plt.Figure:
         fv_df = context.get_result("fiber_volley")
         epsp_df = context.get_result("epsp")
         ps_df = context.get_result("pop_spike")
@@ -33,47 +33,41 @@ class AnnotatedPlot(Plot):
                 "(e.g., fiber_volley, epsp, or pop_spike)."
             )
 
-        with plt.style.context(self.style):
-            with plt.rc_context(self.rc_params):
-                
-                fig, ax = plt.subplots()
-                used_labels: set[str] = set()
-
-                stim_order = list(self.stim_intensities) or list(pd.unique(abf_df["stim_intensity"]))
-                cmap = plt.get_cmap(self.color_map)
-                n_colors = max(len(stim_order), 1)
-
-                for idx, stim in enumerate(stim_order):
-                    g = abf_df.loc[abf_df["stim_intensity"] == stim]
-                    if g.empty:
-                        continue
-                    color = cmap(idx / (n_colors - 1)) if n_colors > 1 else 'black'
-
-                    if "mean" not in g.columns:
-                        raise ValueError("Expected 'mean' column in averaged data.")
-
-                    x = g["time"].to_numpy()
-                    y = g["mean"].to_numpy()
-                    y = self.apply_smoothing(y, fs=fs)
-
-                    ax.plot(x, y, label=f"{stim} µA", color=color)
-                    self.annotate_features(ax, stim, fv_df, epsp_df, ps_df, used_labels)
-
-                ax.set_title('Evoked Field Potential with Annotations')
-                ax.set_xlabel('Time (ms)')
-                ax.set_ylabel('Voltage (mV)')
-                ax.legend()
-                ax.grid()
-                ax.xaxis.set_major_formatter(FuncFormatter(lambda x, pos: f"{x * 1000:.0f}"))
-                fig.tight_layout()
-                return fig
+        with self._style_context():
+            fig, ax = self._subplots(fig)
+            plotted: list = []
+
+            stim_order = self._stim_order(context)
+            colors = self._stim_colors(len(stim_order))
+
+            rows = self._smoothed_rows(context)
+
+            handles: list = []
+            n_out = self._display_points(fig)
+            for idx, stim in enumerate(stim_order):
+                row = rows.get(stim)
+                if row is None:
+                    continue
+                x, y = emath.lttb(*row, n_out)
+                handles += ax.plot(x, y, label=f"{stim} µA", color=colors[idx])
+                plotted.append(stim)
+
+            handles += self.annotate_features(ax, plotted, fv_df, epsp_df, ps_df)
+
+            ax.set_title('Evoked Field Potential with Annotations')
+            ax.set_xlabel('Time (ms)')
+            ax.set_ylabel('Voltage (mV)')
+            # Explicit handles skip legend()'s scan of every artist.
+            ax.legend(handles=handles)
+            ax.grid()
+            ax.xaxis.set_major_formatter(FuncFormatter(_s_to_ms))
+            return fig
 
     def render(self, context: RecordingContext) -> None:
         """
         Render the sweep plot for the given context.
         """
-        self._build_figure(context)
-        plt.show()
+        self._show(self._figure(context))
 
     def save(
         self,
@@ -81,111 +75,68 @@ class AnnotatedPlot(Plot):
         output_path: Path | str,
         output_stem: str | None = None,
     ) -> Path:
-        fig = self._build_figure(context)
+        fig = self._figure(context, for_save=True)
         save_path = self._resolve_output_path(
             context,
             output_path,
             output_stem=output_stem,
         )
-        fig.savefig(save_path, dpi=300, bbox_inches="tight")
-        plt.close(fig)
+        fig.savefig(save_path, dpi=_SAVE_DPI, bbox_inches="tight")
+        self._release_figure(fig)
         return save_path
 
+    # (result columns, legend label, marker, face color, zorder) per marker kind
+    _MARKERS = {
+        "fiber_volley": [
+            ("fv_s", "fv_v", "Fiber Volley", "v", to_rgba("darkviolet", alpha=0.7), 5),
+        ],
+        "epsp": [
+            ("slope_mid_s", "slope_mid_v", "fEPSP Slope", "s", to_rgba("firebrick", alpha=0.8), 6),
+            ("epsp_s", "epsp_v", "fEPSP", "o", to_rgba("royalblue", alpha=0.8), 6),
+        ],
+        "pop_spike": [
+            ("ps_s", "ps_v", "Population Spike", "d", to_rgba("darkorange", alpha=0.8), 7),
+        ],
+    }
+
     def annotate_features(
         self,
         ax: plt.Axes,
-        stim: float,
+        stims: list,
         fv_df: pd.DataFrame | None,
         epsp_df: pd.DataFrame | None,
         ps_df: pd.DataFrame | None,
-        used_labels: set[str],
-    ) -> None:
-        fv_color = to_rgba("darkviolet", alpha=0.7)
-        epsp_slope_color = to_rgba("firebrick", alpha=0.8)
-        epsp_min_color = to_rgba("royalblue", alpha=0.8)
-        ps_color = to_rgba("darkorange", alpha=0.8)
-
-        if isinstance(fv_df, pd.DataFrame) and not fv_df.empty and (fv_df.stim_intensity == stim).any():
-            r = fv_df.loc[fv_df.stim_intensity == stim].iloc[0]
-            fv_s, fv_v = r.get("fv_s"), r.get("fv_v")
-            if pd.notna(fv_s) and pd.notna(fv_v):
-                label = "Fiber Volley" if "Fiber Volley" not in used_labels else None
-                ax.scatter(
-                    [fv_s],
-                    [fv_v],
-                    s=70,
-                    marker="v",
-                    facecolors=fv_color,
-                    edgecolors="black",
-                    linewidths=1.0,
-                    zorder=5,
-                    label=label,
-                )
-                used_labels.add("Fiber Volley")
-            else:
-                fv_s, fv_v = r.get("fv_s"), r.get("fv_v")
-                if pd.notna(fv_s) and pd.notna(fv_v):
-                    label = "Fiber Volley" if "Fiber Volley" not in used_labels else None
-                    ax.scatter(
-                        [fv_s],
-                        [fv_v],
-                        s=70,
-                        marker="v",
-                        facecolors=fv_color,
-                        edgecolors="black",
-                        linewidths=1.0,
-                        zorder=5,
-                        label=label,
-                    )
-                    used_labels.add("Fiber Volley")
-
-        if isinstance(epsp_df, pd.DataFrame) and not epsp_df.empty and (epsp_df.stim_intensity == stim).any():
-            r = epsp_df.loc[epsp_df.stim_intensity == stim].iloc[0]
-            slope_s, slope_v = r.get("slope_mid_s"), r.get("slope_mid_v")
-            epsp_s, epsp_v = r.get("epsp_s"), r.get("epsp_v")
-            if pd.notna(slope_s) and pd.notna(slope_v):
-                label = "fEPSP Slope" if "fEPSP Slope" not in used_labels else None
-                ax.scatter(
-                    [slope_s],
-                    [slope_v],
-                    s=70,
-                    marker="s",
-                    facecolors=epsp_slope_color,
-                    edgecolors="black",
-                    linewidths=1.0,
-                    zorder=6,
-                    label=label,
-                )
-                used_labels.add("fEPSP Slope")
-            if pd.notna(epsp_s) and pd.notna(epsp_v):
-                label = "fEPSP" if "fEPSP" not in used_labels else None
-                ax.scatter(
-                    [epsp_s],
-                    [epsp_v],
-                    s=70,
-                    marker="o",
-                    facecolors=epsp_min_color,
-                    edgecolors="black",
-                    linewidths=1.0,
-                    zorder=6,
-                    label=label,
-                )
-                used_labels.add("fEPSP")
-
-        if isinstance(ps_df, pd.DataFrame) and not ps_df.empty and (ps_df.stim_intensity == stim).any():
-            r = ps_df.loc[ps_df.stim_intensity == stim].iloc[0]
-            ps_s, ps_v = r.get("ps_s"), r.get("ps_v")
-            if pd.notna(ps_s) and pd.notna(ps_v):
-                label = "Population Spike" if "Population Spike" not in used_labels else None
-                ax.scatter(
-                    [ps_s],
-                    [ps_v],
+    ) -> list:
+        """
+        Mark feature points of the plotted stims, one scatter per marker kind.
+
+        Each kind collects its (time, voltage) points across all stims first,
+        so the axes get one collection and one legend entry per kind rather
+        than one artist per stim. Returns the scatters, for the legend.
+        """
+        results = {"fiber_volley": fv_df, "epsp": epsp_df, "pop_spike": ps_df}
+        scatters = []
+        for name, markers in self._MARKERS.items():
+            df = results[name]
+            if not isinstance(df, pd.DataFrame) or df.empty:
+                continue
+            # First result row of each plotted stim, as annotated previously.
+            rows = df.loc[df["stim_intensity"].isin(stims)].drop_duplicates("stim_intensity")
+            for x_col, y_col, label, marker, color, zorder in markers:
+                if x_col not in rows or y_col not in rows:
+                    continue
+                pts = rows[[x_col, y_col]].dropna()
+                if pts.empty:
+                    continue
+                scatters.append(ax.scatter(
+                    pts[x_col].to_numpy(),
+                    pts[y_col].to_numpy(),
                     s=70,
-                    marker="d",
-                    facecolors=ps_color,
+                    marker=marker,
+                    facecolors=color,
                     edgecolors="black",
                     linewidths=1.0,
-                    zorder=7,
+                    zorder=zorder,
                     label=label,
-                )
-                used_labels.add("Population Spike")
+                ))
+        return scatters
@@ -1,15 +1,101 @@
 from __future__ import annotations
 
+import importlib.resources
+import weakref
 from abc import ABC, abstractmethod
+from functools import lru_cache
 from pathlib import Path
 
-from epspkit.core.context import RecordingContext
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+from matplotlib.widgets import MultiCursor
+
+from epspkit.core import math as emath
+from epspkit.core.context import RecordingContext, split_traces
 from epspkit.core.config import VizConfig, SmoothingConfig
-from epspkit.features.base import Feature
+from epspkit.core.smoothing import SmoothingMixin
 import scienceplots
 
 
-class Plot(ABC):
+# Settings that describe the session rather than the look of a figure. These
+# are the keys ``matplotlib.style.use`` documents as ignored; restoring them
+# from a snapshot would switch backends or reset interactive mode.
+_SESSION_RC_KEYS = frozenset({
+    "backend",
+    "backend_fallback",
+    "date.epoch",
+    "docstring.hardcopy",
+    "figure.max_open_warning",
+    "figure.raise_window",
+    "interactive",
+    "savefig.directory",
+    "timezone",
+    "tk.window_focus",
+    "toolbar",
+    "webagg.address",
+    "webagg.open_in_browser",
+    "webagg.port",
+    "webagg.port_retries",
+})
+
+
+# Names ``matplotlib.style.use`` maps onto other styles.
+_STYLE_ALIASES = {"mpl20": "default", "mpl15": "classic"}
+
+
+def _style_entry_rc(style) -> dict:
+    """rcParams set by one style name, package style, file path or dict."""
+    if isinstance(style, str):
+        style = _STYLE_ALIASES.get(style, style)
+        if style == "default":
+            return dict(matplotlib.rcParamsDefault)
+        if style in plt.style.library:
+            return dict(plt.style.library[style])
+        if "." in style and not Path(style).exists():
+            # "package.name" -> name.mplstyle shipped inside that package.
+            pkg, _, name = style.rpartition(".")
+            try:
+                style = importlib.resources.files(pkg) / f"{name}.mplstyle"
+            except (ModuleNotFoundError, TypeError):
+                pass
+    if isinstance(style, dict):
+        return dict(style)
+    return dict(matplotlib.rc_params_from_file(str(style), use_default_template=False))
+
+
+@lru_cache(maxsize=32)
+def _resolved_rc(style: str | tuple) -> dict:
+    """
+    rcParams ``plt.style.context(style)`` would set, resolved once per style.
+
+    Only the keys the style itself sets are kept, so applying them with
+    ``plt.rc_context`` layers the style over the live rcParams — settings
+    the user changes later still show through, as with
+    ``plt.style.context``. Treat the returned dict as read-only.
+    """
+    rc: dict = {}
+    for entry in style if isinstance(style, tuple) else (style,):
+        rc.update(_style_entry_rc(entry))
+    return {k: v for k, v in rc.items() if k not in _SESSION_RC_KEYS}
+
+
+# matplotlib 3.11 deprecated MultiCursor's leading (unused) canvas argument.
+_MULTICURSOR_TAKES_CANVAS = matplotlib.__version_info__ < (3, 11)
+
+# Resolution figures are saved at; traces are downsampled against it.
+_SAVE_DPI = 300
+
+
+def _s_to_ms(value: float, pos: int | None = None) -> str:
+    """Tick formatter labelling a time axis in seconds as whole milliseconds."""
+    return format(value * 1000.0, ".0f")
+
+
+class Plot(SmoothingMixin, ABC):
     """
     Base class for all epspkit plotters.
 
@@ -18,6 +104,10 @@ class Plot(ABC):
       - read config from `self.config.params`
     """
 
+    # (style key, cleared Figure) kept by save() for the next save() of the
+    # same plot class; see _take_pooled_figure.
+    _pooled_fig: tuple | None = None
+
     def __init__(self, config: VizConfig, effective_smoothing: SmoothingConfig | None = None):
         """
         Parameters
@@ -35,13 +125,201 @@ class Plot(ABC):
             or config.smoothing
             or SmoothingConfig()
         )
+        # (context weakref, context.version, figure) of the last build.
+        self._cached_figure: tuple | None = None
+        # (figure, MultiCursor) so the widget lives as long as its figure.
+        self._cursor: tuple | None = None
 
     @abstractmethod
     def render(self, context: RecordingContext) -> None:
         """Render the plot for the given context."""
         raise NotImplementedError
 
-    apply_smoothing = Feature.apply_smoothing
+    def _figure(self, context: RecordingContext, for_save: bool = False) -> plt.Figure:
+        """
+        ``_build_figure(context)``, reusing the last figure while it is still
+        open and the context has not changed since.
+
+        Lets ``render`` followed by ``save`` build the figure once. With
+        ``for_save`` and no such figure, the figure is built on the pooled
+        off-screen Figure; hand it back with ``_release_figure``.
+        """
+        if self._cached_figure is not None:
+            ref, version, fig = self._cached_figure
+            if ref() is context and version == context.version and plt.fignum_exists(fig.number):
+                return fig
+        if for_save:
+            return self._build_figure(context, self._take_pooled_figure())
+        fig = self._build_figure(context)
+        self._cached_figure = (weakref.ref(context), context.version, fig)
+        return fig
+
+    def _pool_key(self) -> str:
+        return repr((self.style, sorted(self.rc_params.items(), key=str)))
+
+    def _take_pooled_figure(self) -> Figure:
+        """
+        The cleared Figure the last ``save()`` of this plot class released,
+        or a new one.
+
+        Pooled figures are plain ``Figure`` objects, not registered with
+        pyplot, so ``plt.show()`` never displays them. Batch export of many
+        recordings then reuses one figure and canvas per plot class instead
+        of allocating and tearing down a pyplot figure per file. Figures are
+        only reused across the same style and rc params, since figure-level
+        properties (facecolor, dpi, ...) are fixed when the figure is made.
+        """
+        pooled, type(self)._pooled_fig = type(self)._pooled_fig, None
+        if pooled is not None and pooled[0] == self._pool_key():
+            return pooled[1]
+        with self._style_context():
+            return Figure()
+
+    def _release_figure(self, fig: plt.Figure) -> None:
+        """
+        Clear a figure ``save()`` built and return it to the pool.
+
+        A figure reused from the render cache is left untouched: it is still
+        open in the window ``render()`` showed it in.
+        """
+        if self._cached_figure is not None and fig is self._cached_figure[2]:
+            return
+        fig.clear()
+        type(self)._pooled_fig = (self._pool_key(), fig)
+
+    @classmethod
+    def close_pool(cls) -> None:
+        """Drop the pooled figure of this plot class, e.g. at the end of a batch."""
+        cls._pooled_fig = None
+
+    @staticmethod
+    def _subplots(
+        fig: Figure | None,
+        nrows: int = 1,
+        ncols: int = 1,
+        figsize: tuple[float, float] | None = None,
+        **kwargs,
+    ):
+        """
+        ``plt.subplots(..., layout="constrained")``, or the same axes grid
+        on ``fig`` (a pooled figure) when given.
+        """
+        if fig is None:
+            return plt.subplots(nrows, ncols, figsize=figsize, layout="constrained", **kwargs)
+        fig.set_size_inches(figsize or plt.rcParams["figure.figsize"])
+        fig.set_layout_engine("constrained")
+        return fig, fig.subplots(nrows, ncols, **kwargs)
+
+    def _show(self, fig: plt.Figure) -> None:
+        """
+        Show ``fig``, with a vertical cursor across its axes if
+        ``config.cursor`` is set.
+
+        The cursor is blitted: on mouse motion only its line is redrawn over
+        a cached copy of each axes, instead of re-rendering every trace.
+        """
+        if self.config.cursor and fig.axes and (self._cursor is None or self._cursor[0] is not fig):
+            props = dict(useblit=True, horizOn=False, vertOn=True, color="0.3", lw=0.8)
+            args = (fig.canvas, fig.axes) if _MULTICURSOR_TAKES_CANVAS else (fig.axes,)
+            cursor = MultiCursor(*args, **props)
+            self._cursor = (fig, cursor)
+        plt.show()
+
+    def _stim_order(self, context: RecordingContext) -> list:
+        """
+        Stims to draw, in color order: the configured list, else every stim
+        of the averaged data in ascending order.
+
+        The averaged stims come from ``context.stim_unique``, so the long
+        ``stim_intensity`` column is scanned at most once per context.
+        """
+        if self.stim_intensities:
+            return list(self.stim_intensities)
+        return context.stim_unique.tolist()
+
+    def _smoothed_rows(self, context: RecordingContext) -> dict:
+        """
+        ``{stim: (time, smoothed mean)}`` of the averaged traces.
+
+        With the matrix layout the rows are views into
+        ``smoothed_traces(context)``, the context-level cache shared with the
+        features and every other plot of the same smoothing policy, so each
+        trace is filtered once per context however many plots draw it.
+        Otherwise the stims are smoothed here: in one 2-D call when their
+        traces have equal lengths (on differing time grids), else one by one.
+        """
+        if context.averaged_matrix is not None:
+            traces = self.smoothed_traces(context)
+            x = context.time_axis
+            return {stim: (x, traces[k]) for k, stim in enumerate(context.stim_axis.tolist())}
+
+        abf_df = context.averaged
+        if "mean" not in abf_df.columns:
+            raise ValueError("Expected 'mean' column in averaged data.")
+        stims, bounds, time, values = split_traces(abf_df)
+        lengths = np.diff(bounds)
+        if lengths.size and (lengths == lengths[0]).all():
+            n_time = int(lengths[0])
+            times = time.reshape(-1, n_time)
+            smoothed = self.apply_smoothing(values.reshape(-1, n_time), fs=context.fs, axis=1)
+            return {stim: (times[k], smoothed[k]) for k, stim in enumerate(stims.tolist())}
+        return {
+            stim: (time[a:b], self.apply_smoothing(values[a:b], fs=context.fs))
+            for stim, a, b in zip(stims.tolist(), bounds[:-1], bounds[1:])
+        }
+
+    @staticmethod
+    def _display_points(fig: plt.Figure) -> int:
+        """
+        Points per trace worth drawing: two per pixel column of ``fig`` at
+        the save resolution.
+
+        Longer traces are LTTB-downsampled to this before plotting, which
+        keeps them visually unchanged in saved images and on screen while
+        matplotlib builds far smaller paths.
+        """
+        return 2 * int(fig.get_figwidth() * _SAVE_DPI)
+
+    def _add_traces(self, ax: plt.Axes, traces: list, colors: list, labels: list) -> list:
+        """
+        Draw ``(x, y)`` traces as a single LineCollection, one color each.
+
+        One collection draws far faster than one Line2D per stim, and
+        traces longer than ``_display_points`` are LTTB-downsampled first.
+        Returns
+        matching proxy Line2D handles for ``ax.legend(handles=...)``, since
+        the collection itself has a single legend entry.
+        """
+        if not traces:
+            return []
+        n_out = self._display_points(ax.figure)
+        ax.add_collection(LineCollection(
+            [np.column_stack(emath.lttb(x, y, n_out)) for x, y in traces],
+            colors=colors,
+            # Line2D's solid-line defaults, so traces look as ax.plot drew them.
+            capstyle=plt.rcParams["lines.solid_capstyle"],
+            joinstyle=plt.rcParams["lines.solid_joinstyle"],
+        ))
+        ax.autoscale_view()
+        return [Line2D([], [], color=c, label=label) for c, label in zip(colors, labels)]
+
+    def _stim_colors(self, n_colors: int) -> list:
+        """
+        One color per stim from ``self._cmap``, sampled in a single call:
+        evenly spaced over the colormap, or black for a lone stim.
+        """
+        if n_colors <= 1:
+            return ["black"] * n_colors
+        return list(self._cmap(np.arange(n_colors) / (n_colors - 1)))
+
+    def _style_context(self):
+        """Context manager applying ``self.style`` then ``self.rc_params``."""
+        style = tuple(self.style) if isinstance(self.style, list) else self.style
+        try:
+            rc = _resolved_rc(style)
+        except TypeError:  # unhashable style (a dict): resolve uncached
+            rc = _resolved_rc.__wrapped__(style)
+        return plt.rc_context({**rc, **self.rc_params})
 
     def _resolve_output_path(
         self,
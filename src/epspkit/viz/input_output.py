@@ -3,13 +3,19 @@ from __future__ import annotations
 from pathlib import Path
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 
 from epspkit.core.config import SmoothingConfig, VizConfig
 from epspkit.core.context import RecordingContext
-from epspkit.viz.base import Plot
+from epspkit.viz.base import _SAVE_DPI, Plot
 import warnings
 
+try:
+    import polars as pl
+except ImportError:  # pragma: no cover - optional dependency
+    pl = None
+
 class IOPlot(Plot):
     """
     Plots input output curves, including fiber volley amplitude vs stimulus intensity and EPSP slope vs stimulus intensity.
@@ -20,12 +26,13 @@ class IOPlot(Plot):
         self.style = config.style
         self.color_map = config.color_map
 
-    def _build_figure(self, context: RecordingContext) -> plt.Figure:
+    def _build_figure(self, context: RecordingContext, fig: plt.Figure | None = None) -> plt.Figure:
         fv_df = context.get_result("fiber_volley")
         epsp_df = context.get_result("epsp")
 
-        fv_ok = fv_df is not None and not fv_df.empty
-        epsp_ok = epsp_df is not None and not epsp_df.empty
+        # len() rather than .empty so Polars results are accepted as well.
+        fv_ok = fv_df is not None and len(fv_df) > 0
+        epsp_ok = epsp_df is not None and len(epsp_df) > 0
 
         if not fv_ok and not epsp_ok:
             raise ValueError("IOPlot requires fiber_volley or epsp results.")
@@ -40,50 +47,82 @@ class IOPlot(Plot):
 
         ncols = (fv_ok and epsp_ok) + fv_ok + epsp_ok
 
-        with plt.style.context(self.style):
-            with plt.rc_context(self.rc_params):
-                fig, axes = plt.subplots(1, ncols, figsize=(4 * ncols, 4))
-                if ncols == 1:
-                    axes = [axes]
-
-                axes = list(axes)
-
-                # 1) epsp_slope vs fv_amp
-                if fv_ok and epsp_ok:
-                    ax = axes.pop(0)
-                    ax.scatter(fv_df["fv_amp"], epsp_df["epsp_slope"])
-                    ax.set_xlabel("Fiber Volley Amplitude (mV)")
-                    ax.set_ylabel("fEPSP Slope (mV/ms)")
-                    ax.set_title("Synaptic Strength")
-                    ax.grid(True)
-
-                # 2) fv_amp vs stim_intensity
-                if fv_ok:
-                    ax = axes.pop(0)
-                    ax.scatter(fv_df["stim_intensity"], fv_df["fv_amp"])
-                    ax.set_xlabel("Stimulus Intensity (µA)")
-                    ax.set_ylabel("Fiber Volley Amplitude (mV)")
-                    ax.set_title("Presynaptic Excitability")
-                    ax.grid(True)
-
-                # 3) epsp_slope vs stim_intensity
-                if epsp_ok:
-                    ax = axes.pop(0)
-                    ax.scatter(epsp_df["stim_intensity"], epsp_df["epsp_slope"])
-                    ax.set_xlabel("Stimulus Intensity (µA)")
-                    ax.set_ylabel("fEPSP Slope (mV/ms)")
-                    ax.set_title("Postsynaptic Responsiveness")
-                    ax.grid(True)
-
-                fig.tight_layout()
-                return fig
+        with self._style_context():
+            fig, axes = self._subplots(fig, 1, ncols, figsize=(4 * ncols, 4))
+            if ncols == 1:
+                axes = [axes]
+
+            axes = list(axes)
+
+            # 1) epsp_slope vs fv_amp, paired by stim rather than by row
+            # position, so differently ordered results still line up.
+            if fv_ok and epsp_ok:
+                ax = axes.pop(0)
+                merged = self._join_on_stim(fv_df, epsp_df)
+                self._plot_points(ax, merged["fv_amp"], merged["epsp_slope"])
+                ax.set_xlabel("Fiber Volley Amplitude (mV)")
+                ax.set_ylabel("fEPSP Slope (mV/ms)")
+                ax.set_title("Synaptic Strength")
+                ax.grid(True)
+
+            # 2) fv_amp vs stim_intensity
+            if fv_ok:
+                ax = axes.pop(0)
+                self._plot_points(ax, fv_df["stim_intensity"], fv_df["fv_amp"])
+                ax.set_xlabel("Stimulus Intensity (µA)")
+                ax.set_ylabel("Fiber Volley Amplitude (mV)")
+                ax.set_title("Presynaptic Excitability")
+                ax.grid(True)
+
+            # 3) epsp_slope vs stim_intensity
+            if epsp_ok:
+                ax = axes.pop(0)
+                self._plot_points(ax, epsp_df["stim_intensity"], epsp_df["epsp_slope"])
+                ax.set_xlabel("Stimulus Intensity (µA)")
+                ax.set_ylabel("fEPSP Slope (mV/ms)")
+                ax.set_title("Postsynaptic Responsiveness")
+                ax.grid(True)
+
+            return fig
+
+    @staticmethod
+    def _join_on_stim(fv_df, epsp_df):
+        """
+        Inner join of ``fv_amp`` and ``epsp_slope`` on ``stim_intensity``.
+
+        Two Polars results are joined by Polars itself; anything else goes
+        through pandas, converting a lone Polars frame first.
+        """
+        fv_cols, epsp_cols = ["stim_intensity", "fv_amp"], ["stim_intensity", "epsp_slope"]
+        if pl is not None and isinstance(fv_df, pl.DataFrame) and isinstance(epsp_df, pl.DataFrame):
+            return fv_df.select(fv_cols).join(epsp_df.select(epsp_cols), on="stim_intensity", how="inner")
+        if pl is not None:
+            fv_df, epsp_df = (
+                df.to_pandas() if isinstance(df, pl.DataFrame) else df for df in (fv_df, epsp_df)
+            )
+        return fv_df[fv_cols].merge(epsp_df[epsp_cols], on="stim_intensity")
+
+    @staticmethod
+    def _plot_points(ax: plt.Axes, x: pd.Series, y: pd.Series) -> None:
+        """
+        Draw unconnected markers from float64 arrays.
+
+        One marker-only Line2D per series is cheaper to build and draw than
+        a scatter PathCollection for the few points of an I/O curve. Polars
+        series convert through their own zero-copy ``to_numpy``.
+        """
+        ax.plot(
+            np.asarray(x.to_numpy(), dtype=np.float64),
+            np.asarray(y.to_numpy(), dtype=np.float64),
+            linestyle="",
+            marker="o",
+        )
 
     def render(self, context: RecordingContext) -> None:
         """
         Render the sweep plot for the given context.
         """
-        self._build_figure(context)
-        plt.show()
+        self._show(self._figure(context))
 
     def save(
         self,
@@ -91,12 +130,12 @@ class IOPlot(Plot):
         output_path: Path | str,
         output_stem: str | None = None,
     ) -> Path:
-        fig = self._build_figure(context)
+        fig = self._figure(context, for_save=True)
         save_path = self._resolve_output_path(
             context,
             output_path,
             output_stem=output_stem,
         )
-        fig.savefig(save_path, dpi=300, bbox_inches="tight")
-        plt.close(fig)
+        fig.savefig(save_path, dpi=_SAVE_DPI, bbox_inches="tight")
+        self._release_figure(fig)
         return save_path
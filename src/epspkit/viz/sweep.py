@@ -3,12 +3,11 @@ from __future__ import annotations
 from pathlib import Path
 
 import matplotlib.pyplot as plt
-import pandas as pd
 from matplotlib.ticker import FuncFormatter
 
 from epspkit.core.config import SmoothingConfig, VizConfig
 from epspkit.core.context import RecordingContext
-from epspkit.viz.base import Plot
+from epspkit.viz.base import _SAVE_DPI, Plot, _s_to_ms
 
 class SweepPlot(Plot):
     """
@@ -19,50 +18,40 @@ class SweepPlot(Plot):
         self.rc_params = config.rc_params or {}
         self.style = config.style
         self.color_map = config.color_map
+        self._cmap = plt.get_cmap(self.color_map)
 
-    def _build_figure(self, context: RecordingContext) -> plt.Figure:
-        abf_df = context.averaged
-        fs = context.fs
+    def _build_figure(self, context: RecordingContext, fig: plt.Figure | None = None) -> plt.Figure:
+        with self._style_context():
+            fig, ax = self._subplots(fig)
 
-        with plt.style.context(self.style):
-            with plt.rc_context(self.rc_params):
+            stim_order = self._stim_order(context)
+            colors = self._stim_colors(len(stim_order))
 
-                fig, ax = plt.subplots()
+            rows = self._smoothed_rows(context)
 
-                stim_order = list(self.stim_intensities) or list(pd.unique(abf_df["stim_intensity"]))
-                cmap = plt.get_cmap(self.color_map)
-                n_colors = max(len(stim_order), 1)
+            traces, trace_colors, labels = [], [], []
+            for idx, stim in enumerate(stim_order):
+                row = rows.get(stim)
+                if row is None:
+                    continue
+                traces.append(row)
+                trace_colors.append(colors[idx])
+                labels.append(f"{stim}")
+            handles = self._add_traces(ax, traces, trace_colors, labels)
 
-                for idx, stim in enumerate(stim_order):
-                    g = abf_df.loc[abf_df["stim_intensity"] == stim]
-                    if g.empty:
-                        continue
-                    color = cmap(idx / (n_colors - 1)) if n_colors > 1 else 'black'
-
-                    if "mean" not in g.columns:
-                        raise ValueError("Expected 'mean' column in averaged data.")
-
-                    x = g["time"].to_numpy()
-                    y = g["mean"].to_numpy()
-                    y = self.apply_smoothing(y, fs=fs)
-
-                    ax.plot(x, y, label=f"{stim}", color=color)
-
-                ax.set_title('Evoked Field Potentials')
-                ax.set_xlabel('Time (ms)')
-                ax.set_ylabel('Response (mV)')
-                ax.legend(title='Stimulus Intensity (µA)')
-                ax.grid()
-                ax.xaxis.set_major_formatter(FuncFormatter(lambda x, pos: f"{x * 1000:.0f}"))
-                fig.tight_layout()
-                return fig
+            ax.set_title('Evoked Field Potentials')
+            ax.set_xlabel('Time (ms)')
+            ax.set_ylabel('Response (mV)')
+            ax.legend(handles=handles, title='Stimulus Intensity (µA)')
+            ax.grid()
+            ax.xaxis.set_major_formatter(FuncFormatter(_s_to_ms))
+            return fig
 
     def render(self, context: RecordingContext) -> None:
         """
         Render the sweep plot for the given context.
         """
-        self._build_figure(context)
-        plt.show()
+        self._show(self._figure(context))
 
     def save(
         self,
@@ -70,12 +59,12 @@ class SweepPlot(Plot):
         output_path: Path | str,
         output_stem: str | None = None,
     ) -> Path:
-        fig = self._build_figure(context)
+        fig = self._figure(context, for_save=True)
         save_path = self._resolve_output_path(
             context,
             output_path,
             output_stem=output_stem,
         )
-        fig.savefig(save_path, dpi=300, bbox_inches="tight")
-        plt.close(fig)
+        fig.savefig(save_path, dpi=_SAVE_DPI, bbox_inches="tight")
+        self._release_figure(fig)
         return save_path
@@ -0,0 +1,80 @@
+import matplotlib
+
+matplotlib.use("Agg")
+
+import numpy as np
+import pytest
+import pyabf.abfWriter
+
+from epspkit.core.config import (
+    FeatureConfig,
+    IOConfig,
+    PipelineConfig,
+    SmoothingConfig,
+    TransformConfig,
+)
+
+FS = 20000
+N_SAMPLES = 1000
+STIMS = [25, 50, 75, 100, 150, 200]
+REPNUM = 3
+
+
+def synthetic_sweeps(seed: int = 0) -> np.ndarray:
+    """Artifact, fiber volley, EPSP and pop spike whose size grows with stim."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(N_SAMPLES) / FS
+    sweeps = []
+    for k in range(len(STIMS)):
+        g = (k + 1) / len(STIMS)
+        for _ in range(REPNUM):
+            y = 5.0 * np.exp(-((t - 0.0003) / 0.0002) ** 2)
+            y += -0.4 * g * np.exp(-((t - 0.002) / 0.0003) ** 2)
+            y += -2.0 * g * np.exp(-((t - 0.005) / 0.0015) ** 2)
+            y += 1.2 * g * np.exp(-((t - 0.0062) / 0.0002) ** 2)
+            y += 0.3 + rng.normal(0.0, 0.02, N_SAMPLES)
+            sweeps.append(y)
+    return np.array(sweeps)
+
+
+@pytest.fixture(scope="session")
+def abf_paths(tmp_path_factory):
+    """Three synthetic ABF recordings with different noise."""
+    root = tmp_path_factory.mktemp("abf")
+    paths = []
+    for seed in range(3):
+        path = root / f"recording_{seed + 1}.abf"
+        pyabf.abfWriter.writeABF1(synthetic_sweeps(seed), str(path), FS)
+        paths.append(str(path))
+    return paths
+
+
+def _pipeline_config(input_paths, **io_kwargs) -> PipelineConfig:
+    return PipelineConfig(
+        io=IOConfig(
+            input_paths=list(input_paths),
+            stim_intensities=STIMS,
+            repnum=REPNUM,
+            write_results=False,
+            write_plots=False,
+            render_plots=False,
+            **io_kwargs,
+        ),
+        transforms=[
+            TransformConfig("baseline_correction", {"baseline_window_ms": (0.0, 0.1)}),
+            TransformConfig("crop_stim_artifact", {"window_ms": (0.0, 1.0)}),
+            TransformConfig("average_sweeps"),
+        ],
+        features=[
+            FeatureConfig("fiber_volley", {"window_ms": (0.5, 2.5)}),
+            FeatureConfig("epsp", {"window_ms": (3.0, 6.0), "fit_distance": 4}),
+            FeatureConfig("pop_spike", {"lag_ms": 3.0, "prominence": 0.02}),
+        ],
+        global_smoothing=SmoothingConfig(method="savgol", window_size=21, polyorder=3),
+    )
+
+
+@pytest.fixture
+def make_config():
+    """Factory for a full transform/feature pipeline over ``input_paths``."""
+    return _pipeline_config
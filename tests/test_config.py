@@ -0,0 +1,18 @@
+import copy
+import pickle
+
+from epspkit.core.config import FeatureConfig, SmoothingConfig
+
+
+def test_smoothing_config_pickle_round_trip():
+    config = SmoothingConfig(method="savgol", window_size=21, polyorder=2)
+    restored = pickle.loads(pickle.dumps(config))
+    assert restored == config
+    assert hash(restored) == hash(config)
+    assert copy.deepcopy(config) == config
+
+
+def test_feature_config_with_smoothing_pickle_round_trip():
+    config = FeatureConfig("epsp", {"window_ms": (3.0, 6.0)}, SmoothingConfig(method="moving_average"))
+    restored = pickle.loads(pickle.dumps(config))
+    assert restored == config
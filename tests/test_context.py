@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from epspkit.core.context import RecordingContext
+
+
+def _averaged(offset: float = 0.0) -> pd.DataFrame:
+    time = np.arange(5) / 1000.0
+    return pd.DataFrame({
+        "stim_intensity": np.repeat([10, 20], time.size),
+        "time": np.tile(time, 2),
+        "mean": np.arange(10, dtype=np.float64) + offset,
+        "sem": np.zeros(10),
+    })
+
+
+def test_assigning_averaged_rebuilds_matrix_and_caches():
+    context = RecordingContext(tidy=pd.DataFrame(), averaged=pd.DataFrame(), fs=1000.0)
+    assert context.averaged_matrix is None
+    assert not context.averaged_is_current
+
+    context.averaged = _averaged()
+    np.testing.assert_array_equal(context.averaged_matrix, np.arange(10.0).reshape(2, 5))
+    assert context.averaged_is_current
+
+    context.smoothed_cache["stale"] = context.averaged_matrix
+    version = context.version
+    context.averaged = _averaged(offset=100.0)
+    assert context.smoothed_cache == {}
+    assert context.version > version
+    np.testing.assert_array_equal(
+        context.averaged_matrix, np.arange(10.0).reshape(2, 5) + 100.0
+    )
+
+
+def test_constructing_with_averaged_builds_matrix():
+    context = RecordingContext(tidy=pd.DataFrame(), averaged=_averaged(), fs=1000.0)
+    assert context.averaged_is_current
+    np.testing.assert_array_equal(context.stim_axis, [10, 20])
+    assert context.averaged_matrix.shape == (2, 5)
+
+
+def test_stim_unique_is_ascending_with_and_without_matrix():
+    averaged = _averaged()
+    averaged["stim_intensity"] = np.repeat([20, 10], 5)
+    context = RecordingContext(tidy=pd.DataFrame(), averaged=averaged, fs=1000.0)
+    np.testing.assert_array_equal(context.stim_unique, [10, 20])
+
+    # Ragged traces have no matrix layout and fall back to the column scan.
+    ragged = averaged.iloc[:-1]
+    context.averaged = ragged
+    assert context.averaged_matrix is None
+    np.testing.assert_array_equal(context.stim_unique, [10, 20])
+
+
+def test_set_tidy_marks_averaged_out_of_date():
+    context = RecordingContext(tidy=pd.DataFrame(), averaged=_averaged(), fs=1000.0)
+    assert context.averaged_is_current
+    context.set_tidy(pd.DataFrame({"voltage": [1.0]}))
+    assert not context.averaged_is_current
+    context.set_averaged(_averaged())
+    assert context.averaged_is_current
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from epspkit.core.config import FeatureConfig
+from epspkit.core.context import RecordingContext
+from epspkit.features.epsp import EPSPFeature
+from epspkit.features.fiber_volley import FiberVolleyFeature
+from epspkit.features.pop_spike import PopSpikeFeature
+
+
+def test_slope_uses_actual_sample_times_across_a_gap():
+    # A mid-trace crop leaves a gap in the time axis; the derivative must be
+    # taken against the real sample times, not a uniform spacing.
+    fs = 20000.0
+    idx = np.concatenate([np.arange(0, 60), np.arange(100, 200)])
+    x = idx / fs
+    y = -((x * 1000.0) ** 2)
+    traces = np.vstack([y, 0.5 * y])
+
+    feature = EPSPFeature(FeatureConfig("epsp", {"window_ms": (1.0, 9.0), "fit_distance": 4}))
+    result = feature.calculate_traces(np.array([10, 20]), x, traces, None)
+
+    start, stop = np.searchsorted(x, (0.001, 0.009))
+    for row, trace in zip(result.itertuples(), traces):
+        expected = start + np.argmin(np.gradient(trace, x)[start:stop])
+        assert row.slope_mid_s == x[expected]
+        assert row.epsp_s == x[start + np.argmin(trace[start:stop])]
+
+
+def _ragged_averaged() -> pd.DataFrame:
+    fs = 20000.0
+    frames = []
+    for stim, n, gain in [(10, 200, 1.0), (20, 180, 2.0)]:
+        x = np.arange(n) / fs
+        mean = -gain * np.exp(-((x - 0.005) / 0.0015) ** 2)
+        frames.append(pd.DataFrame({"stim_intensity": stim, "time": x, "mean": mean, "sem": 0.0}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_ragged_averaged_traces_are_measured_per_stim():
+    averaged = _ragged_averaged()
+    feature = EPSPFeature(FeatureConfig("epsp", {"window_ms": (1.0, 8.0), "fit_distance": 3}))
+    with pytest.warns(RuntimeWarning):
+        result = feature.calculate(averaged, None, fs=20000.0)
+
+    assert list(result["stim_intensity"]) == [10, 20]
+    for row, (stim, group) in zip(result.itertuples(), averaged.groupby("stim_intensity")):
+        x, y = group["time"].to_numpy(), group["mean"].to_numpy()
+        with pytest.warns(RuntimeWarning):
+            expected = feature.calculate_traces(np.array([stim]), x, y[np.newaxis, :], None)
+        pd.testing.assert_frame_equal(result.iloc[[row.Index]].reset_index(drop=True), expected)
+
+
+def test_pipeline_features_run_on_ragged_averaged_context():
+    context = RecordingContext(tidy=pd.DataFrame(), averaged=_ragged_averaged(), fs=20000.0)
+    assert context.averaged_matrix is None
+    context = FiberVolleyFeature(FeatureConfig("fiber_volley", {"window_ms": (0.5, 2.5)})).run(context)
+    context = EPSPFeature(FeatureConfig("epsp", {"window_ms": (1.0, 8.0), "fit_distance": 3})).run(context)
+    context = PopSpikeFeature(FeatureConfig("pop_spike", {"lag_ms": 3.0, "prominence": 0.02})).run(context)
+    assert len(context.get_result("epsp")) == 2
+    assert np.isfinite(context.get_result("epsp")["epsp_slope"]).all()
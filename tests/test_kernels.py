@@ -0,0 +1,212 @@
+import warnings
+
+import numpy as np
+import pytest
+from scipy import stats
+from scipy.signal import find_peaks, peak_prominences
+
+from epspkit.core._kernels import (
+    _epsp_kernel,
+    _fv_kernel,
+    _fv_trough,
+    _linreg,
+    _peaks_with_prominence,
+    _prominence,
+    _ps_kernel,
+    _ps_peak,
+)
+from epspkit.core.config import FeatureConfig
+from epspkit.features.epsp import EPSPFeature
+
+
+def _traces(dtype=np.float64) -> list[np.ndarray]:
+    """Rows covering noise, plateaus, edge peaks, NaNs and flat lines."""
+    rng = np.random.default_rng(0)
+    rows = [
+        rng.normal(size=200),
+        np.round(rng.normal(size=200), 1),  # many ties and plateaus
+        np.array([0.0, 1.0, 1.0, 1.0, 0.0, 2.0, 2.0, 0.0, -1.0, -1.0, 0.5, 0.5]),
+        np.linspace(0.0, 1.0, 50),  # maximum on the last sample only
+        np.linspace(1.0, 0.0, 50),  # maximum on the first sample only
+        np.zeros(50),
+        np.full(50, np.nan),
+    ]
+    with_nan = rng.normal(size=200)
+    with_nan[[3, 50, 51, 120]] = np.nan
+    rows.append(with_nan)
+    return [np.ascontiguousarray(row, dtype=dtype) for row in rows]
+
+
+def _windows(n: int) -> list[tuple[int, int]]:
+    return [(0, n), (3, n - 2), (n // 3, n // 3 + 1), (5, 5), (n // 2, n)]
+
+
+def _ref_trough(y, i0, i1):
+    troughs, _ = find_peaks(-y[i0:i1])
+    if troughs.size == 0:
+        return -1
+    return i0 + int(troughs[np.argmin(y[i0:i1][troughs])])
+
+
+def _ref_peaks(y, i0, i1):
+    peaks, _ = find_peaks(y[i0:i1])
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # zero-prominence peaks on plateaus
+        prominences = peak_prominences(y[i0:i1], peaks, wlen=None)[0]
+    return i0 + peaks, prominences
+
+
+def _ref_ps(y, i0, i1, min_prominence):
+    peaks, prominences = _ref_peaks(y, i0, i1)
+    keep = prominences >= min_prominence
+    if not keep.any():
+        return -1
+    return int(peaks[keep][np.argmax(prominences[keep])])
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_fv_trough_matches_find_peaks(dtype):
+    for y in _traces(dtype):
+        for i0, i1 in _windows(y.size):
+            # find_peaks compares in the input dtype; the kernel widens to float64.
+            assert _fv_trough(y, i0, i1) == _ref_trough(y.astype(np.float64), i0, i1)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_peaks_with_prominence_matches_scipy(dtype):
+    for y in _traces(dtype):
+        y64 = y.astype(np.float64)
+        for i0, i1 in _windows(y.size):
+            out_peaks = np.empty(max((i1 - i0) // 2, 1), dtype=np.int64)
+            out_prominences = np.empty(out_peaks.size)
+            n = _peaks_with_prominence(y, i0, i1, out_peaks, out_prominences)
+            peaks, prominences = _ref_peaks(y64, i0, i1)
+            np.testing.assert_array_equal(out_peaks[:n], peaks)
+            np.testing.assert_array_equal(out_prominences[:n], prominences)
+            for peak, prominence in zip(peaks, prominences):
+                assert _prominence(y, int(peak), i0, i1) == prominence
+
+
+@pytest.mark.parametrize("min_prominence", [0.0, 0.5, 2.0])
+def test_ps_peak_matches_find_peaks(min_prominence):
+    for y in _traces():
+        for i0, i1 in _windows(y.size):
+            assert _ps_peak(y, i0, i1, min_prominence) == _ref_ps(y, i0, i1, min_prominence)
+
+
+def test_row_kernels_match_single_row_kernels():
+    rows = [y for y in _traces() if y.size == 200]
+    traces = np.ascontiguousarray(np.vstack(rows))
+    n = traces.shape[0]
+
+    fv_idx = np.empty(n, dtype=np.int64)
+    _fv_kernel(traces, 10, 150, fv_idx)
+    assert list(fv_idx) == [_fv_trough(row, 10, 150) for row in traces]
+
+    i0 = np.arange(n, dtype=np.int64) * 7
+    i1 = i0 + 90
+    ps_idx = np.empty(n, dtype=np.int64)
+    _ps_kernel(traces, i0, i1, 0.5, ps_idx)
+    assert list(ps_idx) == [_ps_peak(row, a, b, 0.5) for row, a, b in zip(traces, i0, i1)]
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_linreg_matches_linregress(dtype):
+    rng = np.random.default_rng(1)
+    # Absolute times and voltages, as in a recording, to exercise conditioning.
+    x = 0.25 + np.arange(100) / 20000.0
+    y = (-80.0 - 350.0 * x + rng.normal(scale=0.05, size=x.size)).astype(dtype)
+    for i0, i1 in [(0, 100), (10, 19), (40, 42)]:
+        m, b, r2 = _linreg(x, y, i0, i1)
+        ref = stats.linregress(x[i0:i1], y[i0:i1].astype(np.float64))
+        np.testing.assert_allclose(m, ref.slope, rtol=1e-6)
+        np.testing.assert_allclose(b, ref.intercept, rtol=1e-6)
+        np.testing.assert_allclose(r2, ref.rvalue ** 2, rtol=1e-6, atol=1e-9)
+
+
+def test_linreg_flat_trace_has_no_r2():
+    x = np.arange(10) / 1000.0
+    m, b, r2 = _linreg(x, np.full(10, 3.0), 0, 10)
+    assert m == 0.0
+    assert b == 3.0
+    assert np.isnan(r2)
+
+
+@pytest.mark.parametrize("i0, i1", [(4, 5), (4, 4)])
+def test_linreg_degenerate_window_is_nan(i0, i1):
+    x = np.arange(10) / 1000.0
+    y = np.arange(10, dtype=np.float64)
+    assert all(np.isnan(v) for v in _linreg(x, y, i0, i1))
+    assert all(np.isnan(v) for v in _linreg(np.zeros(10), y, 0, 10))
+
+
+def test_epsp_fit_distance_zero_gives_nan_slope():
+    x = np.arange(200) / 20000.0
+    traces = -np.exp(-((x - 0.005) / 0.0015) ** 2)[np.newaxis, :]
+    feature = EPSPFeature(FeatureConfig("epsp", {"window_ms": (1.0, 8.0), "fit_distance": 0}))
+    with pytest.warns(RuntimeWarning):
+        result = feature.calculate_traces(np.array([10]), x, traces, None)
+    assert np.isnan(result["epsp_slope"].iloc[0])
+    assert np.isnan(result["epsp_r2"].iloc[0])
+
+
+@pytest.fixture(scope="module")
+def numpy_kernels():
+    """A copy of ``_kernels`` imported as if numba were not installed."""
+    import importlib.util
+    import sys
+
+    import epspkit.core._kernels as compiled
+
+    spec = importlib.util.spec_from_file_location("_kernels_without_numba", compiled.__file__)
+    module = importlib.util.module_from_spec(spec)
+    saved = sys.modules.get("numba")
+    sys.modules["numba"] = None  # makes "from numba import ..." raise ImportError
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        if saved is None:
+            del sys.modules["numba"]
+        else:
+            sys.modules["numba"] = saved
+    assert not module.NUMBA_AVAILABLE
+    return module
+
+
+def test_numpy_fallback_peaks_match_kernels(numpy_kernels):
+    for y in _traces():
+        for i0, i1 in _windows(y.size):
+            assert numpy_kernels._fv_trough(y, i0, i1) == _fv_trough(y, i0, i1)
+            assert numpy_kernels._ps_peak(y, i0, i1, 0.5) == _ps_peak(y, i0, i1, 0.5)
+            size = max((i1 - i0) // 2, 1)
+            got = (np.empty(size, dtype=np.int64), np.empty(size))
+            ref = (np.empty(size, dtype=np.int64), np.empty(size))
+            n = numpy_kernels._peaks_with_prominence(y, i0, i1, *got)
+            assert n == _peaks_with_prominence(y, i0, i1, *ref)
+            np.testing.assert_array_equal(got[0][:n], ref[0][:n])
+            np.testing.assert_array_equal(got[1][:n], ref[1][:n])
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("fit_distance", [0, 1, 4])
+def test_numpy_fallback_epsp_matches_kernel(numpy_kernels, dtype, fit_distance):
+    rng = np.random.default_rng(3)
+    idx = np.concatenate([np.arange(0, 60), np.arange(100, 260)])  # gapped grid
+    x = 0.2 + idx / 20000.0
+    base = -np.exp(-((x - 0.209) / 0.0015) ** 2)
+    traces = base * np.arange(1, 5)[:, np.newaxis] + rng.normal(scale=0.01, size=(4, x.size))
+    traces[2, 70:75] = np.nan
+    traces = np.ascontiguousarray(traces, dtype=dtype)
+
+    got, ref = np.empty((6, 4)), np.empty((6, 4))
+    for kernels, out in ((numpy_kernels, got), (None, ref)):
+        kernel = _epsp_kernel if kernels is None else kernels._epsp_kernel
+        kernel(x, traces, 20, 200, fit_distance, *out)
+    np.testing.assert_array_equal(got[:4], ref[:4])  # epsp and slope-centre samples
+    np.testing.assert_allclose(got[4:], ref[4:], rtol=1e-7, equal_nan=True)
+
+
+def test_numpy_fallback_linreg_degenerate_is_nan(numpy_kernels):
+    x = np.arange(10) / 1000.0
+    assert all(np.isnan(v) for v in numpy_kernels._linreg(x, x, 3, 4))
+    assert all(np.isnan(v) for v in numpy_kernels._linreg(np.zeros(10), x, 0, 10))
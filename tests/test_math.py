@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from scipy.signal import savgol_filter
+
+from epspkit.core import math as emath
+
+
+@pytest.mark.parametrize("n_threads", [1, 2])
+@pytest.mark.parametrize("window_size, polyorder", [(5, 2), (21, 3), (51, 4)])
+@pytest.mark.parametrize("dtype, rtol", [(np.float64, 1e-10), (np.float32, 1e-5)])
+def test_savgol_matches_scipy_on_both_branches(monkeypatch, n_threads, window_size, polyorder, dtype, rtol):
+    if n_threads > 1 and not emath.NUMBA_AVAILABLE:
+        pytest.skip("the multi-threaded branch needs numba")
+    # The compiled FIR is chosen by thread count; report the requested count
+    # so the branch is exercised whatever the host's core count.
+    monkeypatch.setattr(emath, "get_num_threads", lambda: n_threads)
+    calls = []
+    fir_rows = emath._fir_rows
+    monkeypatch.setattr(emath, "_fir_rows", lambda *args: calls.append(1) or fir_rows(*args))
+
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=(6, 400)).cumsum(axis=1).astype(dtype)
+    out = emath.savgol(y, window_size, polyorder, axis=-1)
+
+    assert bool(calls) == (n_threads > 1)
+    assert out.dtype == dtype
+    expected = savgol_filter(y.astype(np.float64), window_size, polyorder, mode="interp", axis=-1)
+    np.testing.assert_allclose(out, expected, rtol=rtol, atol=rtol * np.abs(expected).max())
+
+
+def test_savgol_matches_scipy_along_axis_0():
+    rng = np.random.default_rng(1)
+    y = rng.normal(size=(300, 4))
+    np.testing.assert_allclose(
+        emath.savgol(y, 21, 3, axis=0),
+        savgol_filter(y, 21, 3, mode="interp", axis=0),
+        rtol=1e-10,
+        atol=1e-12,
+    )
+
+
+def _trace(n: int, dtype=np.float64):
+    rng = np.random.default_rng(2)
+    x = 0.1 + np.arange(n) / 20000.0
+    return x, rng.normal(size=n).cumsum().astype(dtype)
+
+
+@pytest.mark.parametrize("n, n_out", [(1000, 3), (1000, 100), (1001, 250), (5000, 4999)])
+def test_lttb_keeps_endpoints_and_length(n, n_out):
+    x, y = _trace(n)
+    xd, yd = emath.lttb(x, y, n_out)
+    assert xd.size == yd.size == n_out
+    assert (xd[0], yd[0], xd[-1], yd[-1]) == (x[0], y[0], x[-1], y[-1])
+    # Output samples are a strictly increasing subset of the input.
+    idx = np.searchsorted(x, xd)
+    assert np.all(np.diff(idx) > 0)
+    np.testing.assert_array_equal(y[idx], yd)
+
+
+@pytest.mark.parametrize("n_out", [2, 1000, 2000])
+def test_lttb_returns_short_traces_unchanged(n_out):
+    x, y = _trace(1000)
+    xd, yd = emath.lttb(x, y, n_out)
+    np.testing.assert_array_equal(xd, x)
+    np.testing.assert_array_equal(yd, y)
+
+
+def test_lttb_returns_traces_with_nan_unchanged():
+    x, y = _trace(1000)
+    y[500] = np.nan
+    xd, yd = emath.lttb(x, y, 100)
+    assert xd.size == 1000
+    np.testing.assert_array_equal(yd, y)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("n, n_out", [(1000, 3), (1000, 100), (1234, 567)])
+def test_lttb_numpy_fallback_matches_numba(monkeypatch, dtype, n, n_out):
+    if not emath.NUMBA_AVAILABLE:
+        pytest.skip("needs numba to compare against")
+    x, y = _trace(n, dtype)
+    compiled = emath.lttb(x, y, n_out)
+    monkeypatch.setattr(emath, "NUMBA_AVAILABLE", False)
+    fallback = emath.lttb(x, y, n_out)
+    np.testing.assert_array_equal(fallback[0], compiled[0])
+    np.testing.assert_array_equal(fallback[1], compiled[1])
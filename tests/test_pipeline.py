@@ -0,0 +1,14 @@
+import pandas as pd
+
+from epspkit.pipeline.api import run_pipeline
+
+
+def test_thread_pool_matches_serial(abf_paths, make_config):
+    serial = run_pipeline(make_config(abf_paths, n_jobs=1, n_workers=1))
+    threaded = run_pipeline(make_config(abf_paths, n_jobs=1, n_workers=2))
+
+    assert len(threaded) == len(abf_paths)
+    for expected, actual in zip(serial, threaded):
+        assert set(actual.results) == set(expected.results)
+        for name, frame in expected.results.items():
+            pd.testing.assert_frame_equal(actual.results[name], frame)
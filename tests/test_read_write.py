@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from epspkit.io.read_write import (
+    _read_abf_arrays,
+    clear_abf_cache,
+    load_abf_to_context,
+    save_contexts_to_xlsx,
+)
+from epspkit.pipeline.api import run_pipeline
+
+
+def test_clear_abf_cache_releases_parsed_recordings(abf_paths, make_config):
+    io = make_config(abf_paths).io
+    stims, repnum = list(io.stim_intensities), io.repnum
+    clear_abf_cache()
+    first = load_abf_to_context(abf_paths[0], stims, repnum)
+    again = load_abf_to_context(abf_paths[0], stims, repnum)
+    assert _read_abf_arrays.cache_info().hits == 1
+    np.testing.assert_array_equal(first.tidy["voltage"], again.tidy["voltage"])
+
+    clear_abf_cache()
+    assert _read_abf_arrays.cache_info().currsize == 0
+    reloaded = load_abf_to_context(abf_paths[0], stims, repnum)
+    np.testing.assert_array_equal(first.tidy["voltage"], reloaded.tidy["voltage"])
+
+
+def test_single_workbook_uses_prefixes_and_a_stem_index(abf_paths, make_config, tmp_path):
+    contexts = run_pipeline(make_config(abf_paths[:2]))
+    stems = ["2024_01_15_slice1_ctrl", "2024_01_15_slice2_ctrl"]
+    save_contexts_to_xlsx(contexts, str(tmp_path), stems)
+
+    sheets = pd.read_excel(tmp_path / "results.xlsx", sheet_name=None)
+    assert list(sheets)[0] == "recordings"
+    index = sheets["recordings"]
+    assert list(index["sheet_prefix"]) == ["r1_", "r2_"]
+    assert list(index["output_stem"]) == stems
+    for prefix, context in zip(index["sheet_prefix"], contexts):
+        for name, result in context.results.items():
+            sheet = sheets[f"{prefix}result_{name}"]
+            assert len(sheet) == len(result)
@@ -0,0 +1,41 @@
+import matplotlib.pyplot as plt
+import pytest
+
+from epspkit.core.config import VizConfig
+from epspkit.viz.sweep import SweepPlot
+
+
+@pytest.mark.parametrize("style", ["ggplot", ["ggplot", {"axes.grid": False}], {"font.size": 9.0}])
+def test_style_context_layers_over_live_rcparams(style):
+    plot = SweepPlot(VizConfig("sweep", style=style, rc_params={"axes.labelsize": 11.0}))
+    with plot._style_context():
+        pass  # resolve (and cache) the style once
+    with plt.rc_context({"lines.linewidth": 5.0}):
+        with plot._style_context():
+            got = dict(plt.rcParams)
+        with plt.style.context(style), plt.rc_context({"axes.labelsize": 11.0}):
+            expected = dict(plt.rcParams)
+    assert got["lines.linewidth"] == 5.0
+    assert got["axes.labelsize"] == 11.0
+    for key in ("lines.linewidth", "axes.grid", "axes.facecolor", "font.size"):
+        assert got[key] == expected[key]
+
+
+def test_save_keeps_a_figure_left_open_by_render(abf_paths, make_config, tmp_path, monkeypatch):
+    from epspkit.pipeline.api import run_pipeline
+
+    context = run_pipeline(make_config(abf_paths[:1]))[0]
+    plot = SweepPlot(VizConfig("sweep"))
+    monkeypatch.setattr(plt, "show", lambda *args, **kwargs: None)  # non-blocking show
+    plot.render(context)
+    fig = plot._cached_figure[2]
+
+    plot.save(context, tmp_path)
+    assert plt.fignum_exists(fig.number)
+    assert fig.axes  # not cleared for the pool either
+    plt.close(fig)
+
+    # Figures save() builds itself still go back to the pool.
+    plot.save(context, tmp_path)
+    assert type(plot)._pooled_fig is not None
+    assert not plt.get_fignums()